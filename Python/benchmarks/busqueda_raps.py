@@ -0,0 +1,83 @@
+import sys
+import os
+import random
+import sqlite3
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from busqueda.indice_raps import IndiceRaps
+
+VERBOS = ["IDENTIFICAR", "APLICAR", "DESARROLLAR", "VERIFICAR", "ANALIZAR", "PLANIFICAR", "ELABORAR", "EVALUAR"]
+OBJETOS = [
+    "la dinámica organizacional", "los requisitos del software", "técnicas de programación",
+    "la calidad del producto", "procesos de negociación", "modelos de datos", "la cultura física",
+    "estructuras gramaticales en inglés", "la solución tecnológica", "pruebas de integración",
+]
+CONTEXTOS = ["según normativa", "de acuerdo con el proyecto", "en el ambiente de trabajo", "con ética profesional"]
+
+CONSULTAS = ["dinámica organizacional", "requisitos del software", "programación", "inglés", "pruebas"]
+
+
+def generar_competencias(num_programas: int, semilla: int = 7) -> list:
+    """Competencias sintéticas con la forma de la salida de extraer_raps"""
+    aleatorio = random.Random(semilla)
+    programas = []
+    for p in range(num_programas):
+        unidad_raps = []
+        for c in range(12):
+            raps = [
+                f"{r:02d} {aleatorio.choice(VERBOS)} {aleatorio.choice(OBJETOS)} {aleatorio.choice(CONTEXTOS)}"
+                for r in range(1, 5)
+            ]
+            unidad_raps.append({
+                "codigo_competencia": str(220000000 + p * 100 + c),
+                "resultados_aprendizaje": raps,
+                "conocimientos_proceso": "\n".join(f"* {aleatorio.choice(OBJETOS)}" for _ in range(8)),
+            })
+        programas.append((str(228000 + p), unidad_raps))
+    return programas
+
+
+def cronometrar(funcion, repeticiones: int = 20) -> float:
+    """Tiempo medio en milisegundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+if __name__ == "__main__":
+    num_programas = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    indice = IndiceRaps()
+    inicio = time.perf_counter()
+    for codigo_programa, unidad_raps in generar_competencias(num_programas):
+        indice.agregar_competencias(unidad_raps, codigo_programa)
+    construccion = (time.perf_counter() - inicio) * 1000
+
+    # Referencia: tabla raps en SQLite consultada con LIKE '%...%' (como el controlador)
+    conexion = sqlite3.connect(":memory:")
+    conexion.execute("CREATE TABLE raps (id TEXT, denominacion TEXT)")
+    conexion.executemany(
+        "INSERT INTO raps VALUES (?, ?)",
+        [(i, d["denominacion"]) for i, d in indice.documentos.items()]
+    )
+
+    print(f"RAPs indexados: {len(indice.documentos)} ({num_programas} programas), construcción {construccion:.0f} ms\n")
+    print(f"{'consulta':<26}{'LIKE ms':>10}{'subcadena ms':>14}{'ranking ms':>12}{'filas':>8}")
+
+    for consulta in CONSULTAS:
+        like = [r[0] for r in conexion.execute(
+            "SELECT id FROM raps WHERE denominacion LIKE ?", [f"%{consulta}%"]
+        )]
+        subcadena = indice.buscar_subcadena(consulta)
+
+        t_like = cronometrar(lambda: conexion.execute(
+            "SELECT id FROM raps WHERE denominacion LIKE ?", [f"%{consulta}%"]).fetchall())
+        t_sub = cronometrar(lambda: indice.buscar_subcadena(consulta))
+        t_rank = cronometrar(lambda: indice.buscar(consulta))
+
+        # LIKE de SQLite no ignora tildes: la subcadena indexada encuentra al menos lo mismo
+        assert set(like) <= set(subcadena), consulta
+        print(f"{consulta:<26}{t_like:>10.2f}{t_sub:>14.2f}{t_rank:>12.2f}{len(subcadena):>8}")
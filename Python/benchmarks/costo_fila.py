@@ -0,0 +1,96 @@
+import sys
+import os
+import re
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_helpers import norm, es_ruido
+from utils.patrones import (
+    FIN_SECCION_RE, RAP_CONOCIMIENTOS_RE, CARACTERES_REPETIDOS_RE,
+    RAP_ACTIVIDAD_RE, ESPACIOS_RE, IGNORE_KEYS
+)
+
+# Filas sintéticas con la forma de las tablas de los PDF del SENA
+FILAS = [
+    ["UNIDAD DE COMPETENCIA", "Interactuar en lengua inglesa de forma oral y escrita"],
+    ["CÓDIGO NORMA DE COMPETENCIA LABORAL", "240202501"],
+    ["RESULTADOS DE APRENDIZAJE", None],
+    ["01 IDENTIFICAR LA DINÁMICA ORGANIZACIONAL DEL SENA Y EL ROL DE LA FORMACIÓN PROFESIONAL", None],
+    ["4.6 CONOCIMIENTOS", None],
+    ["* Comunicación asertiva en contextos laborales y sociales", None],
+    ["Página 12 de 40", None],
+    ["PERFIL DEL INSTRUCTOR", "Requisitos académicos"],
+    ["DURACIÓN MÁXIMA ESTIMADA DEL APRENDIZAJE (HORAS)", "TOOOTAAAL 3120 horas"],
+    ["EJECUCIÓN", "Desarrollar el módulo", "593343 - 01 IDENTIFICAR LA DINÁMICA 593343 - 02 APLICAR"],
+]
+
+
+# === REFERENCIA: forma anterior (patrones sin compilar y listas por llamada) ===
+def _norm_referencia(s):
+    s = ''.join(c for c in unicodedata.normalize('NFD', s or "") if unicodedata.category(c) != 'Mn').upper()
+    return re.sub(r"\s+", " ", s).strip()
+
+def _es_ruido_referencia(texto):
+    texto_norm = _norm_referencia(texto)
+    ruido_patterns = [
+        r"LINEA TECNOLOGICA", r"RED TECNOLOGICA", r"RED DE CONOCIMIENTO",
+        r"GESTION DE LA INFORMACION", r"TECNOLOGIAS DE LA INFORMACION", r"DISENO Y DESARROLLO",
+        r"^\d+/\d+/\d+\s+\d+:\d+", r"^PAGINA\s+\d+", r"INFORMACION Y LAS COMUNICACIONES",
+        r"^SOFTWARE$", r"^DENOMINACION$"
+    ]
+    for pattern in ruido_patterns:
+        if re.search(pattern, texto_norm):
+            return True
+    return len(texto.strip()) < 10 and not re.search(r"[a-zA-Z]{5,}", texto)
+
+def _fila_referencia(fila):
+    fila_texto = " ".join([c for c in fila if c]).strip()
+    fila_norm = _norm_referencia(fila_texto)
+    ignorar = any(key in fila_norm for key in ["LINEA TECNOLOGICA", "RED TECNOLOGICA", "RED DE CONOCIMIENTO", "DENOMINACION"])
+    fin = any(re.search(p, _norm_referencia(fila_texto)) for p in [
+        r"PERFIL DEL INSTRUCTOR", r"REQUISITOS ACADEMICOS", r"4\.8\s+PERFIL", r"4\.8\.1",
+        r"CONTENIDOS CURRICULARES DE LA COMPETENCIA"])
+    conocimientos = re.search(r"^\s*4\.6\s*CONOCIMIENTOS", _norm_referencia(fila_texto))
+    total = "TOTAL" in re.sub(r"(.)\1+", r"\1", fila_norm)
+    raps = re.findall(r'\d{6,7}\s*-\s*(\d{1,2})\s+([A-ZÀÁÉÍÓÚÑ].+?)(?=\d{6,7}\s*-|\Z)', fila_texto, re.DOTALL)
+    raps = [(c.zfill(2), re.sub(r'\s+', ' ', d.strip())) for c, d in raps]
+    return (ignorar, fin, bool(conocimientos), total, raps, _es_ruido_referencia(fila_texto))
+
+
+# === ACTUAL: registro compartido de patrones compilados ===
+def _fila_actual(fila):
+    fila_texto = " ".join([c for c in fila if c]).strip()
+    fila_norm = norm(fila_texto)
+    ignorar = any(key in fila_norm for key in IGNORE_KEYS)
+    fin = FIN_SECCION_RE.search(fila_norm)
+    conocimientos = RAP_CONOCIMIENTOS_RE.search(fila_norm)
+    total = "TOTAL" in CARACTERES_REPETIDOS_RE.sub(r"\1", fila_norm)
+    raps = [(c.zfill(2), ESPACIOS_RE.sub(' ', d.strip())) for c, d in RAP_ACTIVIDAD_RE.findall(fila_texto)]
+    return (ignorar, bool(fin), bool(conocimientos), total, raps, es_ruido(fila_texto))
+
+
+def medir(funcion, filas, repeticiones):
+    """Retorna el costo medio por fila en microsegundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for fila in filas:
+            funcion(fila)
+    return (time.perf_counter() - inicio) / (repeticiones * len(filas)) * 1e6
+
+
+if __name__ == "__main__":
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    # Ambas versiones deben clasificar igual cada fila
+    for fila in FILAS:
+        assert _fila_referencia(fila) == _fila_actual(fila), fila
+
+    referencia = medir(_fila_referencia, FILAS, repeticiones)
+    actual = medir(_fila_actual, FILAS, repeticiones)
+
+    print(f"Filas: {len(FILAS)} x {repeticiones}")
+    print(f"Referencia (sin compilar): {referencia:8.2f} us/fila")
+    print(f"Registro compilado:        {actual:8.2f} us/fila")
+    print(f"Mejora:                    {referencia / actual:8.2f}x")
@@ -0,0 +1,90 @@
+import sys
+import os
+import codecs
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.entrega_resultado import escribir_resultado, leer_resultado
+
+# Compara la entrega del resultado por stdout (JSON indentado leído por
+# trozos y concatenado, como pythonService.js) contra --mmap (solo handle
+# y longitud por stdout). El productor es este mismo script en un proceso
+# hijo que arma un resultado sintético y lo emite igual que main.py.
+
+TAMANOS = [12, 120, 1200]   # competencias por resultado
+REPETICIONES = 5
+
+
+def resultado_sintetico(num_competencias: int) -> dict:
+    from benchmarks.busqueda_raps import generar_competencias
+
+    unidad_raps = []
+    for _, competencias in generar_competencias((num_competencias + 11) // 12):
+        unidad_raps.extend(competencias)
+    return {"success": True, "data": {"unidadRaps": unidad_raps[:num_competencias]}}
+
+
+def producir(modo: str, num_competencias: int):
+    resultado = resultado_sintetico(num_competencias)
+    if modo == "mmap":
+        print(json.dumps({"success": True, **escribir_resultado(resultado)}, ensure_ascii=False))
+    else:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+
+
+def consumir(modo: str, num_competencias: int) -> dict:
+    """Lanza el productor y retorna latencia, memoria del consumidor y RSS del hijo"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+
+    proceso = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--productor", modo, str(num_competencias)],
+        stdout=subprocess.PIPE,
+    )
+    # Decodificador incremental: un carácter puede quedar partido entre trozos
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    datos = ""
+    for trozo in iter(lambda: proceso.stdout.read(65536), b""):
+        datos += decodificador.decode(trozo)
+    datos += decodificador.decode(b"", final=True)
+    if hasattr(os, "wait4"):
+        _, estado, uso = os.wait4(proceso.pid, 0)
+        rss_hijo_mb = uso.ru_maxrss / 1024
+    else:
+        proceso.wait()
+        rss_hijo_mb = None
+
+    resultado = json.loads(datos)
+    if modo == "mmap":
+        resultado = leer_resultado(resultado["handle"], resultado["longitud"])
+
+    latencia_ms = (time.perf_counter() - inicio) * 1000
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(resultado["data"]["unidadRaps"]) == num_competencias
+    return {"latencia_ms": latencia_ms, "pico_consumidor_mb": pico / 2**20, "rss_hijo_mb": rss_hijo_mb}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--productor":
+        producir(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    tamanos = [int(t) for t in sys.argv[1:]] or TAMANOS
+
+    print(f"{'competencias':>12}{'modo':>8}{'p50 ms':>10}{'máx ms':>10}{'pico cons. MB':>15}{'RSS hijo MB':>13}")
+    for num_competencias in tamanos:
+        for modo in ("stdout", "mmap"):
+            medidas = [consumir(modo, num_competencias) for _ in range(REPETICIONES)]
+            latencias = [m["latencia_ms"] for m in medidas]
+            pico = max(m["pico_consumidor_mb"] for m in medidas)
+            rss = [m["rss_hijo_mb"] for m in medidas if m["rss_hijo_mb"] is not None]
+            rss_texto = f"{max(rss):>13.1f}" if rss else f"{'-':>13}"
+            print(f"{num_competencias:>12}{modo:>8}{statistics.median(latencias):>10.1f}"
+                  f"{max(latencias):>10.1f}{pico:>15.2f}{rss_texto}")
@@ -0,0 +1,52 @@
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdfplumber
+from utils import cache_filas
+from utils.cache_filas import extraer_tablas_pagina, estadisticas_geometria
+
+# Compara page.extract_tables() con el caché de geometría por página.
+# Los objetos de cada página se parsean antes de cronometrar, así los
+# tiempos miden solo la fase de tablas (bordes, celdas y texto).
+
+
+def fase_tablas(paginas, funcion) -> tuple:
+    inicio = time.perf_counter()
+    tablas = [funcion(page) for page in paginas]
+    return tablas, (time.perf_counter() - inicio) * 1000
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python benchmarks/geometria_paginas.py <pdf> [<pdf> ...]", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{'documento':<28}{'páginas':>8}{'original ms':>13}{'caché ms':>10}{'aciertos':>10}")
+    total_original = total_cache = 0.0
+
+    for pdf_path in sys.argv[1:]:
+        with pdfplumber.open(pdf_path) as pdf:
+            paginas = pdf.pages
+            for page in paginas:
+                page.objects
+
+            referencia, t_original = fase_tablas(paginas, lambda page: page.extract_tables())
+            antes = dict(estadisticas_geometria)
+            tablas, t_cache = fase_tablas(paginas, extraer_tablas_pagina)
+
+        # El caché no debe cambiar ninguna celda
+        assert tablas == referencia, pdf_path
+
+        aciertos = estadisticas_geometria["aciertos"] - antes["aciertos"]
+        total_original += t_original
+        total_cache += t_cache
+        print(f"{os.path.basename(pdf_path)[:27]:<28}{len(paginas):>8}{t_original:>13.1f}{t_cache:>10.1f}"
+              f"{aciertos:>6}/{len(paginas):<3}")
+
+    consultas = estadisticas_geometria["aciertos"] + estadisticas_geometria["fallos"]
+    print(f"\nTasa de aciertos: {estadisticas_geometria['aciertos'] / max(consultas, 1):.1%} "
+          f"({len(cache_filas._geometrias)} geometrías distintas)")
+    print(f"Fase de tablas: {total_original:.0f} ms -> {total_cache:.0f} ms")
@@ -0,0 +1,449 @@
+import sys
+import os
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worker.planificador import percentil
+
+# Generador de carga local: simula cargas concurrentes de coordinadores a
+# una tasa de llegada (Poisson) y mide rendimiento, latencias, CPU/RSS por
+# worker y errores. El reporte JSON se puede comparar entre corridas.
+#
+# Cada carga replica lo que hace pdf.controller.js:
+#   programa -> una extracción "todo"
+#   proyecto -> "proyecto", "fases" y "actividades" en secuencia
+
+DIR_PYTHON = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(DIR_PYTHON, "main.py")
+ZYGOTE = os.path.join(DIR_PYTHON, "worker", "zygote.py")
+PLANIFICADOR = os.path.join(DIR_PYTHON, "worker", "planificador.py")
+
+TIPOS_POR_CARGA = {
+    "programa": ["todo"],
+    "proyecto": ["proyecto", "fases", "actividades"],
+}
+
+# Métrica -> True si un valor mayor es mejor (para la comparación)
+METRICAS_COMPARABLES = {
+    "rendimiento_cargas_s": True,
+    "latencia_ms.p50": False,
+    "latencia_ms.p95": False,
+    "latencia_ms.p99": False,
+    "tasa_error": False,
+    "workers.rss_max_mb": False,
+    "workers.cpu_s_por_carga": False,
+}
+
+TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+# === MEDICIÓN DE PROCESOS (/proc, solo Linux) ===
+def leer_proceso(pid: int):
+    """(ppid, cpu_s, rss_mb) de un proceso o None si ya no existe"""
+    try:
+        with open(f"/proc/{pid}/stat") as archivo:
+            campos = archivo.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status") as archivo:
+            rss_kb = next((int(l.split()[1]) for l in archivo if l.startswith("VmRSS:")), 0)
+    except (OSError, ValueError, IndexError):
+        return None
+    ppid = int(campos[1])
+    cpu_s = (int(campos[11]) + int(campos[12])) / TICKS
+    return ppid, cpu_s, rss_kb / 1024
+
+
+class MuestreoProcesos:
+    """
+    Muestrea CPU y RSS del proceso servidor y sus descendientes. Un hijo que
+    vive menos que el intervalo (los fork del zygote) no alcanza a aparecer,
+    así que el CPU total sale del rusage del servidor (ClienteServidor.cerrar)
+    y el muestreo queda para el RSS y el detalle por proceso
+    """
+
+    def __init__(self, pid_raiz: int, intervalo: float = 0.25):
+        self.pid_raiz = pid_raiz
+        self.intervalo = intervalo
+        self.procesos = {}   # pid -> {"cpu_s", "rss_max_mb"}
+        self.disponible = os.path.isdir("/proc")
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+
+    def iniciar(self):
+        if self.disponible:
+            self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo.is_alive():
+            self._hilo.join()
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            self.muestrear()
+            self._detener.wait(self.intervalo)
+
+    def muestrear(self):
+        vivos = {}
+        for nombre in os.listdir("/proc"):
+            if nombre.isdigit():
+                datos = leer_proceso(int(nombre))
+                if datos:
+                    vivos[int(nombre)] = datos
+
+        # Descendientes del servidor (workers del pool o hijos del zygote)
+        familia = {self.pid_raiz}
+        agregados = True
+        while agregados:
+            agregados = False
+            for pid, (ppid, _, _) in vivos.items():
+                if ppid in familia and pid not in familia:
+                    familia.add(pid)
+                    agregados = True
+
+        for pid in familia:
+            if pid not in vivos:
+                continue
+            _, cpu_s, rss_mb = vivos[pid]
+            registro = self.procesos.setdefault(pid, {"cpu_s": 0.0, "rss_max_mb": 0.0})
+            registro["cpu_s"] = max(registro["cpu_s"], cpu_s)
+            registro["rss_max_mb"] = max(registro["rss_max_mb"], rss_mb)
+
+
+# === CLIENTES ===
+class ClienteCli:
+    """Un proceso "python main.py <pdf> <tipo>" por extracción (como pythonService.js)"""
+
+    def __init__(self, entorno: dict):
+        self.entorno = entorno
+        self.procesos = {}
+        self._lock = threading.Lock()
+
+    def iniciar(self):
+        pass
+
+    def extraer(self, pdf_path: str, tipo: str) -> dict:
+        proceso = subprocess.Popen(
+            [sys.executable, MAIN, pdf_path, tipo],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=self.entorno, cwd=DIR_PYTHON,
+        )
+        salida = proceso.stdout.read()
+        proceso.stdout.close()
+
+        if hasattr(os, "wait4"):
+            _, estado, uso = os.wait4(proceso.pid, 0)
+            codigo = os.waitstatus_to_exitcode(estado)
+            with self._lock:
+                self.procesos[proceso.pid] = {
+                    "cpu_s": uso.ru_utime + uso.ru_stime,
+                    "rss_max_mb": uso.ru_maxrss / 1024,
+                }
+        else:
+            codigo = proceso.wait()
+
+        if codigo != 0:
+            return {"success": False, "error": f"Código de salida {codigo}"}
+        return json.loads(salida.decode("utf-8"))
+
+    def cerrar(self) -> dict:
+        return {
+            "disponible": bool(self.procesos),
+            "procesos": self.procesos,
+            "cpu_s_total": sum(p["cpu_s"] for p in self.procesos.values()),
+        }
+
+
+class ClienteServidor:
+    """
+    Protocolo de líneas JSON de worker/zygote.py y worker/planificador.py:
+    un solo servidor de larga vida, respuestas emparejadas por "id"
+    """
+
+    def __init__(self, comando: list, entorno: dict):
+        self.comando = comando
+        self.entorno = entorno
+        self.esperando = {}   # id -> [Event, respuesta]
+        self._lock = threading.Lock()
+        self._ids = iter(range(1, 1 << 62))
+
+    def iniciar(self):
+        self.proceso = subprocess.Popen(
+            self.comando, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            env=self.entorno, cwd=DIR_PYTHON, text=True, encoding="utf-8",
+        )
+        self.muestreo = MuestreoProcesos(self.proceso.pid)
+        self.muestreo.iniciar()
+        threading.Thread(target=self._leer, daemon=True).start()
+
+    def _leer(self):
+        for linea in self.proceso.stdout:
+            try:
+                respuesta = json.loads(linea)
+            except ValueError:
+                continue
+            with self._lock:
+                pendiente = self.esperando.pop(respuesta.get("id"), None)
+            if pendiente:
+                pendiente[1] = respuesta
+                pendiente[0].set()
+
+        # El servidor terminó: liberar a quien siga esperando
+        with self._lock:
+            pendientes, self.esperando = list(self.esperando.values()), {}
+        for pendiente in pendientes:
+            pendiente[1] = {"success": False, "error": "El servidor terminó"}
+            pendiente[0].set()
+
+    def extraer(self, pdf_path: str, tipo: str) -> dict:
+        pendiente = [threading.Event(), None]
+        with self._lock:
+            id_trabajo = next(self._ids)
+            self.esperando[id_trabajo] = pendiente
+            try:
+                self.proceso.stdin.write(json.dumps({"id": id_trabajo, "pdf_path": pdf_path, "tipo": tipo}) + "\n")
+                self.proceso.stdin.flush()
+            except OSError as e:
+                self.esperando.pop(id_trabajo, None)
+                return {"success": False, "error": str(e)}
+        pendiente[0].wait()
+        return pendiente[1]
+
+    def cerrar(self) -> dict:
+        self.proceso.stdin.close()
+        self.muestreo.detener()
+        procesos = self.muestreo.procesos
+
+        if hasattr(os, "wait4"):
+            # El rusage del servidor incluye a todos los descendientes que ya
+            # recogió (el zygote hace waitpid de cada hijo, el pool de sus
+            # workers al cerrar), aunque ninguna muestra los haya visto
+            _, estado, uso = os.wait4(self.proceso.pid, 0)
+            self.proceso.returncode = os.waitstatus_to_exitcode(estado)
+            cpu_total = uso.ru_utime + uso.ru_stime
+        else:
+            self.proceso.wait()
+            cpu_total = sum(p["cpu_s"] for p in procesos.values())
+
+        return {"disponible": self.muestreo.disponible, "procesos": procesos, "cpu_s_total": cpu_total}
+
+
+def crear_cliente(modo: str, workers: int, entorno: dict):
+    if modo == "cli":
+        return ClienteCli(entorno)
+    if modo == "zygote":
+        return ClienteServidor([sys.executable, ZYGOTE], entorno)
+    return ClienteServidor([sys.executable, PLANIFICADOR, "atender", str(workers)], entorno)
+
+
+# === GENERACIÓN DE CARGA ===
+def parsear_mezcla(texto: str) -> dict:
+    """"programa=3,proyecto=1" -> {"programa": 3.0, "proyecto": 1.0}"""
+    mezcla = {}
+    for parte in texto.split(","):
+        clase, _, peso = parte.partition("=")
+        if clase.strip() not in TIPOS_POR_CARGA:
+            raise ValueError(f"Clase de carga desconocida: {clase}")
+        mezcla[clase.strip()] = float(peso or 1)
+    return mezcla
+
+
+def ejecutar_carga(cliente, clase: str, pdf_path: str, registros: list, lock):
+    inicio = time.perf_counter()
+    errores = []
+    for tipo in TIPOS_POR_CARGA[clase]:
+        try:
+            respuesta = cliente.extraer(pdf_path, tipo)
+        except Exception as e:
+            respuesta = {"success": False, "error": str(e)}
+        if not respuesta.get("success"):
+            errores.append(f"{tipo}: {respuesta.get('error')}")
+
+    with lock:
+        registros.append({
+            "clase": clase,
+            "pdf": os.path.basename(pdf_path),
+            "latencia_ms": (time.perf_counter() - inicio) * 1000,
+            "errores": errores,
+        })
+
+
+def resumen_latencias(valores: list) -> dict:
+    if not valores:
+        return {}
+    return {
+        "p50": round(percentil(valores, 50), 1),
+        "p90": round(percentil(valores, 90), 1),
+        "p95": round(percentil(valores, 95), 1),
+        "p99": round(percentil(valores, 99), 1),
+        "max": round(max(valores), 1),
+    }
+
+
+def correr(argumentos) -> dict:
+    entorno = dict(os.environ)
+    if argumentos.sin_cache:
+        # Sidecars siempre caducados, en un directorio propio (limpiar_cache
+        # con TTL 0 borra todo lo que encuentre en DIR_CACHE). Solo evita los
+        # aciertos entre cargas: el paso final del planificador recibe las
+        # páginas de los trozos y no vuelve a leer el sidecar
+        entorno["ALISTAMIENTO_CACHE_DIR"] = tempfile.mkdtemp(prefix="prueba_carga_")
+        entorno["ALISTAMIENTO_CACHE_TTL"] = "0"
+
+    fixtures = {"programa": argumentos.programa or [], "proyecto": argumentos.proyecto or []}
+    mezcla = {clase: peso for clase, peso in parsear_mezcla(argumentos.mezcla).items() if fixtures[clase]}
+    if not mezcla:
+        raise ValueError("Se necesita al menos un PDF de programa o de proyecto para la mezcla")
+
+    aleatorio = random.Random(argumentos.semilla)
+    clases, pesos = list(mezcla), list(mezcla.values())
+
+    cliente = crear_cliente(argumentos.modo, argumentos.workers, entorno)
+    cliente.iniciar()
+
+    registros, lock, hilos = [], threading.Lock(), []
+    inicio = time.perf_counter()
+    siguiente = inicio
+
+    # Llegadas de Poisson (bucle abierto: no se espera a que terminen las anteriores)
+    while True:
+        siguiente += aleatorio.expovariate(argumentos.tasa)
+        if siguiente - inicio > argumentos.duracion:
+            break
+        espera = siguiente - time.perf_counter()
+        if espera > 0:
+            time.sleep(espera)
+
+        clase = aleatorio.choices(clases, pesos)[0]
+        pdf_path = os.path.abspath(aleatorio.choice(fixtures[clase]))
+        hilo = threading.Thread(target=ejecutar_carga, args=(cliente, clase, pdf_path, registros, lock))
+        hilo.start()
+        hilos.append(hilo)
+
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    procesos = cliente.cerrar()
+    if argumentos.sin_cache:
+        shutil.rmtree(entorno["ALISTAMIENTO_CACHE_DIR"], ignore_errors=True)
+
+    latencias = [r["latencia_ms"] for r in registros]
+    fallidas = [r for r in registros if r["errores"]]
+    cpu_total = procesos["cpu_s_total"]
+
+    return {
+        "configuracion": {
+            "modo": argumentos.modo,
+            "workers": argumentos.workers if argumentos.modo == "planificador" else None,
+            "tasa_llegada_s": argumentos.tasa,
+            "duracion_s": argumentos.duracion,
+            "mezcla": mezcla,
+            "fixtures": {clase: [os.path.basename(p) for p in rutas] for clase, rutas in fixtures.items()},
+            "sin_cache": argumentos.sin_cache,
+            "semilla": argumentos.semilla,
+        },
+        "cargas": len(registros),
+        "duracion_real_s": round(duracion, 2),
+        "rendimiento_cargas_s": round(len(registros) / duracion, 3) if duracion else 0.0,
+        "tasa_error": round(len(fallidas) / len(registros), 4) if registros else 0.0,
+        "latencia_ms": resumen_latencias(latencias),
+        "latencia_ms_por_clase": {
+            clase: resumen_latencias([r["latencia_ms"] for r in registros if r["clase"] == clase])
+            for clase in mezcla
+        },
+        "workers": {
+            "disponible": procesos["disponible"],
+            "procesos": len(procesos["procesos"]),
+            "cpu_s_total": round(cpu_total, 2),
+            "cpu_s_por_carga": round(cpu_total / len(registros), 3) if registros else 0.0,
+            "rss_max_mb": round(max((p["rss_max_mb"] for p in procesos["procesos"].values()), default=0.0), 1),
+            "detalle": [
+                {"pid": pid, "cpu_s": round(p["cpu_s"], 2), "rss_max_mb": round(p["rss_max_mb"], 1)}
+                for pid, p in sorted(procesos["procesos"].items())
+            ],
+        },
+        "errores": [{"pdf": r["pdf"], "clase": r["clase"], "errores": r["errores"]} for r in fallidas[:20]],
+    }
+
+
+# === COMPARACIÓN ===
+def valor_metrica(reporte: dict, metrica: str):
+    valor = reporte
+    for parte in metrica.split("."):
+        valor = valor.get(parte) if isinstance(valor, dict) else None
+    return valor
+
+
+def comparar(base: dict, actual: dict, tolerancia: float) -> list:
+    """
+    Compara las métricas clave contra un reporte anterior
+
+    Returns:
+        list: [(metrica, base, actual, cambio relativo, es_regresion)]
+    """
+    filas = []
+    for metrica, mayor_es_mejor in METRICAS_COMPARABLES.items():
+        antes, ahora = valor_metrica(base, metrica), valor_metrica(actual, metrica)
+        if antes is None or ahora is None:
+            continue
+        if antes:
+            cambio = (ahora - antes) / antes
+        else:
+            cambio = 0.0 if not ahora else float("inf")
+        peor = -cambio if mayor_es_mejor else cambio
+        filas.append((metrica, antes, ahora, cambio, peor > tolerancia))
+    return filas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga de la extracción de PDFs")
+    parser.add_argument("--programa", nargs="*", help="PDFs de programa (carga 'todo')")
+    parser.add_argument("--proyecto", nargs="*", help="PDFs de proyecto (proyecto + fases + actividades)")
+    parser.add_argument("--mezcla", default="programa=3,proyecto=1", help="pesos por clase de carga")
+    parser.add_argument("--tasa", type=float, default=1.0, help="cargas por segundo (Poisson)")
+    parser.add_argument("--duracion", type=float, default=30.0, help="segundos generando llegadas")
+    parser.add_argument("--modo", choices=["cli", "zygote", "planificador"], default="cli")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="workers del planificador")
+    parser.add_argument("--sin-cache", action="store_true", help="forzar la extracción completa en cada carga")
+    parser.add_argument("--semilla", type=int, default=7)
+    parser.add_argument("--salida", help="archivo JSON del reporte")
+    parser.add_argument("--comparar", help="reporte anterior contra el cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="empeoramiento relativo permitido")
+    argumentos = parser.parse_args()
+
+    reporte = correr(argumentos)
+
+    if argumentos.salida:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, ensure_ascii=False, indent=2)
+
+    latencia = reporte["latencia_ms"]
+    print(f"Cargas: {reporte['cargas']} en {reporte['duracion_real_s']} s "
+          f"({reporte['rendimiento_cargas_s']} cargas/s), errores {reporte['tasa_error']:.1%}")
+    print(f"Latencia ms: p50 {latencia.get('p50')}  p95 {latencia.get('p95')}  "
+          f"p99 {latencia.get('p99')}  máx {latencia.get('max')}")
+    for clase, valores in reporte["latencia_ms_por_clase"].items():
+        print(f"  {clase:<10} p50 {valores.get('p50')}  p95 {valores.get('p95')}")
+    workers = reporte["workers"]
+    if workers["disponible"]:
+        print(f"Workers: {workers['procesos']} procesos, CPU {workers['cpu_s_total']} s "
+              f"({workers['cpu_s_por_carga']} s/carga), RSS máx {workers['rss_max_mb']} MB")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+
+        filas = comparar(base, reporte, argumentos.tolerancia)
+        print(f"\n{'métrica':<26}{'base':>12}{'actual':>12}{'cambio':>10}")
+        for metrica, antes, ahora, cambio, regresion in filas:
+            marca = "  REGRESIÓN" if regresion else ""
+            print(f"{metrica:<26}{antes:>12}{ahora:>12}{cambio:>+10.1%}{marca}")
+
+        if any(regresion for *_, regresion in filas):
+            sys.exit(1)
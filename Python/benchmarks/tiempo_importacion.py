@@ -0,0 +1,57 @@
+import sys
+import os
+import re
+import subprocess
+
+# Presupuesto de arranque en frío (solo importaciones), en milisegundos
+PRESUPUESTO_MS = 350
+
+TIPOS = ['programa', 'competencias', 'raps', 'proyecto', 'fases', 'actividades', 'todo']
+
+DIR_PYTHON = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINEA_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def medir_importacion(tipo: str) -> dict:
+    """
+    Ejecuta "python -X importtime" importando main y los extractores del
+    tipo, y suma el tiempo acumulado de las importaciones de primer nivel
+    """
+    codigo = f"import main; main.precargar({tipo!r})"
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=DIR_PYTHON, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+
+    total_us = 0
+    modulos = []
+    for linea in proceso.stderr.splitlines():
+        match = LINEA_IMPORTTIME.match(linea)
+        if not match:
+            continue
+        acumulado = int(match.group(2))
+        # Solo el primer nivel (sin sangría) para no contar dos veces
+        if len(match.group(3)) == 1:
+            total_us += acumulado
+            modulos.append((acumulado, match.group(4)))
+
+    modulos.sort(reverse=True)
+    return {"tipo": tipo, "total_ms": total_us / 1000, "top": modulos[:5]}
+
+if __name__ == "__main__":
+    presupuesto = float(sys.argv[1]) if len(sys.argv) > 1 else PRESUPUESTO_MS
+    excedidos = []
+
+    for tipo in TIPOS:
+        medicion = medir_importacion(tipo)
+        estado = "OK" if medicion["total_ms"] <= presupuesto else "EXCEDIDO"
+        print(f"{tipo:<13} {medicion['total_ms']:8.1f} ms  [{estado}]")
+        for acumulado, nombre in medicion["top"]:
+            print(f"    {acumulado / 1000:8.1f} ms  {nombre}")
+        if estado != "OK":
+            excedidos.append(tipo)
+
+    print(f"\nPresupuesto: {presupuesto:.0f} ms")
+    sys.exit(1 if excedidos else 0)
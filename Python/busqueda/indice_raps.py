@@ -0,0 +1,298 @@
+import heapq
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+from collections import defaultdict
+from utils.pdf_helpers import norm
+from utils.rap_parser import procesar_competencia
+
+def log_debug(mensaje):
+    """Enviar logs a stderr para no contaminar stdout"""
+    print(mensaje, file=sys.stderr, flush=True)
+
+TOKEN_RE = re.compile(r"[A-Z0-9Ñ]+")
+
+# Palabras vacías frecuentes en los RAPs (no aportan al ranking)
+STOPWORDS = frozenset([
+    "DE", "LA", "EL", "LOS", "LAS", "Y", "EN", "CON", "DEL", "AL", "POR", "PARA",
+    "SEGUN", "A", "O", "U", "E", "UN", "UNA", "SU", "SUS", "QUE", "SE", "LO",
+])
+
+# Campo de procesar_competencia -> peso en el ranking
+PESOS_CAMPOS = [
+    ("denominacion", 3.0),
+    ("conocimientos_proceso", 1.0),
+    ("conocimientos_saber", 1.0),
+    ("criterios_evaluacion", 1.0),
+]
+
+# Parámetros BM25
+K1 = 1.2
+B = 0.75
+
+# Se incrementa si cambia el formato del archivo (JSON, nunca pickle: el
+# índice se comparte entre procesos y no debe poder ejecutar código al cargarse)
+VERSION_FORMATO = 2
+
+
+def tokenizar(texto: str) -> list:
+    """Tokens normalizados (sin tildes, mayúsculas) sin palabras vacías"""
+    return [t for t in TOKEN_RE.findall(norm(texto)) if t not in STOPWORDS]
+
+
+def trigramas(texto: str) -> set:
+    """Trigramas del texto normalizado (para búsquedas por subcadena)"""
+    texto = norm(texto)
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def clave_rap(codigo_programa, codigo_competencia: str, codigo: str) -> str:
+    """
+    Id de un RAP en el índice: "<codigo_programa>/<codigo_competencia>-<codigo>".
+    Incluye el programa porque las competencias transversales repiten el
+    mismo código (con redacciones distintas) en muchos programas
+    """
+    return f"{codigo_programa or ''}/{codigo_competencia}-{codigo}"
+
+
+class IndiceRaps:
+    """
+    Índice invertido en disco sobre los RAPs que produce extraer_raps.
+    Cada RAP se identifica por programa, competencia y código (clave_rap)
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta
+        self.documentos = {}                   # id -> metadatos del RAP
+        self.terminos_doc = {}                 # id -> {termino: frecuencia ponderada}
+        self.postings = defaultdict(dict)      # termino -> {id: frecuencia ponderada}
+        self.postings_trigramas = defaultdict(set)  # trigrama -> {id}
+        self.raps_programa = defaultdict(set)  # codigo_programa -> {id} (no se guarda)
+        self.longitud_total = 0.0
+
+    # === CONSTRUCCIÓN ===
+    def agregar_competencias(self, unidad_raps: list, codigo_programa=None) -> int:
+        """
+        Indexa los RAPs de una salida de extraer_raps para un programa. Los
+        RAPs que el programa tenía antes se quitan primero, así un RAP que
+        desapareció del documento no sigue apareciendo.
+        Retorna cuántos RAPs se indexaron
+        """
+        self.eliminar_programa(codigo_programa)
+
+        agregados = 0
+        for info_rap in unidad_raps:
+            codigo_competencia = info_rap.get("codigo_competencia")
+            if not codigo_competencia:
+                continue
+            for rap in procesar_competencia(info_rap):
+                self.agregar_rap(codigo_programa, codigo_competencia, rap)
+                agregados += 1
+        return agregados
+
+    def agregar_rap(self, codigo_programa, codigo_competencia: str, rap: dict) -> str:
+        """
+        Indexa un RAP estructurado, reemplazando la versión anterior si
+        existe. Retorna su id
+        """
+        id_nuevo = clave_rap(codigo_programa, codigo_competencia, rap["codigo"])
+        self.eliminar_rap(id_nuevo)
+
+        frecuencias = defaultdict(float)
+        for campo, peso in PESOS_CAMPOS:
+            for termino in tokenizar(rap.get(campo) or ""):
+                frecuencias[termino] += peso
+
+        denominacion_norm = norm(rap["denominacion"])
+        longitud = sum(frecuencias.values())
+
+        self.documentos[id_nuevo] = {
+            "codigo_programa": codigo_programa,
+            "codigo_competencia": codigo_competencia,
+            "codigo": rap["codigo"],
+            "denominacion": rap["denominacion"],
+            "denominacion_norm": denominacion_norm,
+            "longitud": longitud,
+        }
+        self.terminos_doc[id_nuevo] = dict(frecuencias)
+        self.raps_programa[codigo_programa].add(id_nuevo)
+        self.longitud_total += longitud
+
+        for termino, frecuencia in frecuencias.items():
+            self.postings[termino][id_nuevo] = frecuencia
+        for trigrama in trigramas(denominacion_norm):
+            self.postings_trigramas[trigrama].add(id_nuevo)
+
+        return id_nuevo
+
+    def eliminar_programa(self, codigo_programa) -> int:
+        """Quita todos los RAPs de un programa. Retorna cuántos se quitaron"""
+        ids = list(self.raps_programa.get(codigo_programa, ()))
+        for id_viejo in ids:
+            self.eliminar_rap(id_viejo)
+        return len(ids)
+
+    def eliminar_rap(self, id_rap: str):
+        """Quita un RAP del índice (si existe)"""
+        documento = self.documentos.pop(id_rap, None)
+        if documento is None:
+            return
+
+        self.longitud_total -= documento["longitud"]
+        ids_programa = self.raps_programa[documento["codigo_programa"]]
+        ids_programa.discard(id_rap)
+        if not ids_programa:
+            del self.raps_programa[documento["codigo_programa"]]
+        for termino in self.terminos_doc.pop(id_rap, {}):
+            self.postings[termino].pop(id_rap, None)
+            if not self.postings[termino]:
+                del self.postings[termino]
+        for trigrama in trigramas(documento["denominacion_norm"]):
+            self.postings_trigramas[trigrama].discard(id_rap)
+            if not self.postings_trigramas[trigrama]:
+                del self.postings_trigramas[trigrama]
+
+    # === CONSULTAS ===
+    def buscar(self, consulta: str, limite: int = 10) -> list:
+        """
+        Búsqueda por palabras con ranking BM25 (ponderando la denominación)
+
+        Returns:
+            list: [(id_rap, puntaje)] de mayor a menor puntaje
+        """
+        total_docs = len(self.documentos)
+        if not total_docs:
+            return []
+
+        longitud_media = self.longitud_total / total_docs or 1.0
+        puntajes = defaultdict(float)
+
+        for termino in set(tokenizar(consulta)):
+            postings = self.postings.get(termino)
+            if not postings:
+                continue
+            idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for id_rap, frecuencia in postings.items():
+                longitud = self.documentos[id_rap]["longitud"]
+                puntajes[id_rap] += idf * frecuencia * (K1 + 1) / (
+                    frecuencia + K1 * (1 - B + B * longitud / longitud_media)
+                )
+
+        return heapq.nsmallest(limite, puntajes.items(), key=lambda par: (-par[1], par[0]))
+
+    def buscar_subcadena(self, texto: str, limite=None) -> list:
+        """
+        Equivalente indexado de "denominacion LIKE '%texto%'" (sin tildes ni
+        mayúsculas): filtra candidatos por trigramas y verifica la subcadena
+
+        Returns:
+            list: ids de los RAPs cuya denominación contiene el texto
+        """
+        texto_norm = norm(texto)
+        consulta = trigramas(texto_norm)
+
+        if consulta:
+            listas = sorted((self.postings_trigramas.get(t, set()) for t in consulta), key=len)
+            candidatos = set(listas[0]).intersection(*listas[1:])
+        else:
+            candidatos = self.documentos.keys()
+
+        encontrados = sorted(
+            id_rap for id_rap in candidatos
+            if texto_norm in self.documentos[id_rap]["denominacion_norm"]
+        )
+        return encontrados[:limite] if limite else encontrados
+
+    # === PERSISTENCIA ===
+    def guardar(self, ruta=None):
+        """Guarda el índice como JSON de forma atómica (los sets como listas)"""
+        ruta = ruta or self.ruta
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(directorio, exist_ok=True)
+
+        estado = {
+            "version": VERSION_FORMATO,
+            "documentos": self.documentos,
+            "terminos_doc": self.terminos_doc,
+            "postings": self.postings,
+            "postings_trigramas": {t: sorted(ids) for t, ids in self.postings_trigramas.items()},
+            "longitud_total": self.longitud_total,
+        }
+        descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as archivo:
+                json.dump(estado, archivo, ensure_ascii=False)
+            os.replace(temporal, ruta)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "IndiceRaps":
+        """Carga el índice desde disco (o uno vacío si el archivo no existe)"""
+        indice = cls(ruta)
+        if not os.path.exists(ruta):
+            return indice
+
+        try:
+            with open(ruta, encoding="utf-8") as archivo:
+                estado = json.load(archivo)
+        except ValueError:
+            # Índice de una versión anterior (pickle) o archivo dañado
+            estado = {}
+        if not isinstance(estado, dict) or estado.get("version") != VERSION_FORMATO:
+            log_debug("Índice con formato antiguo: se reconstruye desde cero")
+            return indice
+
+        indice.documentos = estado["documentos"]
+        indice.terminos_doc = estado["terminos_doc"]
+        indice.postings = defaultdict(dict, estado["postings"])
+        indice.postings_trigramas = defaultdict(set, {t: set(ids) for t, ids in estado["postings_trigramas"].items()})
+        indice.longitud_total = estado["longitud_total"]
+        for id_rap, documento in indice.documentos.items():
+            indice.raps_programa[documento["codigo_programa"]].add(id_rap)
+        return indice
+
+
+# === PRUEBA DEL MÓDULO ===
+if __name__ == "__main__":
+    import json
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from main import configurar_utf8, procesar_pdf
+
+    configurar_utf8()
+
+    if len(sys.argv) < 4 or sys.argv[1] not in ("agregar", "buscar", "subcadena"):
+        print("Uso: python -m busqueda.indice_raps agregar <indice> <pdf> [<pdf> ...]\n"
+              "     python -m busqueda.indice_raps buscar|subcadena <indice> <texto>", file=sys.stderr)
+        sys.exit(1)
+
+    accion, ruta_indice = sys.argv[1], sys.argv[2]
+    indice = IndiceRaps.cargar(ruta_indice)
+
+    if accion == "agregar":
+        for pdf_path in sys.argv[3:]:
+            respuesta = procesar_pdf(pdf_path, "todo")
+            if not respuesta["success"]:
+                log_debug(f"Error procesando {pdf_path}: {respuesta['error']}")
+                continue
+            programa = (respuesta["data"].get("programa") or [{}])[0]
+            total = indice.agregar_competencias(respuesta["data"].get("unidadRaps", []), programa.get("codigo_programa"))
+            log_debug(f"{pdf_path}: {total} RAPs indexados")
+        indice.guardar()
+        print(json.dumps({"success": True, "raps": len(indice.documentos)}))
+    else:
+        texto = " ".join(sys.argv[3:])
+        if accion == "buscar":
+            resultados = [{"id_rap": i, "puntaje": round(p, 4)} for i, p in indice.buscar(texto)]
+        else:
+            resultados = [{"id_rap": i} for i in indice.buscar_subcadena(texto)]
+        for r in resultados:
+            documento = indice.documentos[r["id_rap"]]
+            r["codigo_programa"] = documento["codigo_programa"]
+            r["denominacion"] = documento["denominacion"]
+        print(json.dumps({"success": True, "data": resultados}, ensure_ascii=False, indent=2))
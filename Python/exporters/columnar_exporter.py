@@ -0,0 +1,212 @@
+import csv
+import hashlib
+import os
+import sys
+from utils.pdf_helpers import extraer_numero_horas
+from utils.rap_parser import procesar_competencia, calcular_duracion_por_rap
+
+def log_debug(mensaje):
+    """Enviar logs a stderr para no contaminar stdout"""
+    print(mensaje, file=sys.stderr, flush=True)
+
+# Valor nulo en los CSV (convención de LOAD DATA INFILE de MySQL)
+NULO_CSV = r"\N"
+
+# === ESQUEMA DE LAS TABLAS EXPORTADAS ===
+# tabla -> [(columna, tipo)], tipo en {"str", "int"}
+ESQUEMA = {
+    "documentos": [
+        ("documento_id", "str"),
+        ("archivo", "str"),
+    ],
+    "competencias": [
+        ("documento_id", "str"),
+        ("codigo_norma", "str"),
+        ("nombre_competencia", "str"),
+        ("unidad_competencia", "str"),
+        ("duracion_maxima", "int"),
+    ],
+    "raps": [
+        ("documento_id", "str"),
+        ("codigo_competencia", "str"),
+        ("codigo_rap", "str"),
+        ("denominacion", "str"),
+        ("duracion", "int"),
+    ],
+    "conocimientos": [
+        ("documento_id", "str"),
+        ("codigo_competencia", "str"),
+        ("codigo_rap", "str"),
+        ("tipo", "str"),
+        ("orden", "int"),
+        ("texto", "str"),
+    ],
+    "actividades": [
+        ("documento_id", "str"),
+        ("orden_actividad", "int"),
+        ("fase", "str"),
+        ("nombre_actividad", "str"),
+    ],
+    "actividad_raps": [
+        ("documento_id", "str"),
+        ("orden_actividad", "int"),
+        ("codigo_rap", "str"),
+        ("denominacion", "str"),
+    ],
+}
+
+# Campo de procesar_competencia -> valor de la columna "tipo" en conocimientos
+TIPOS_CONOCIMIENTO = [
+    ("conocimientos_proceso", "proceso"),
+    ("conocimientos_saber", "saber"),
+    ("criterios_evaluacion", "criterio"),
+]
+
+
+def calcular_documento_id(pdf_path: str) -> str:
+    """Clave estable del documento: hash del contenido (no del nombre)"""
+    sha = hashlib.sha256()
+    with open(pdf_path, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            sha.update(bloque)
+    return sha.hexdigest()[:16]
+
+
+def filas_documento(documento_id: str, competencias: list, unidad_raps: list, actividades: list) -> dict:
+    """
+    Aplana los resultados de extraer_competencias, extraer_raps y
+    extraer_actividades_proyecto de un documento en filas por tabla
+    """
+    tablas = {nombre: [] for nombre in ESQUEMA if nombre != "documentos"}
+    duraciones = {}
+
+    for comp in competencias:
+        duracion = extraer_numero_horas(comp.get("duracion_maxima"))
+        duraciones[comp.get("codigo_norma")] = duracion
+        tablas["competencias"].append([
+            documento_id,
+            comp.get("codigo_norma"),
+            comp.get("nombre_competencia"),
+            comp.get("unidad_competencia"),
+            duracion,
+        ])
+
+    for info_rap in unidad_raps:
+        codigo_competencia = info_rap.get("codigo_competencia")
+        raps = procesar_competencia(info_rap)
+        if not raps:
+            continue
+
+        duracion_por_rap = calcular_duracion_por_rap(duraciones.get(codigo_competencia), len(raps))
+
+        for rap in raps:
+            tablas["raps"].append([
+                documento_id, codigo_competencia, rap["codigo"], rap["denominacion"], duracion_por_rap
+            ])
+            for campo, tipo in TIPOS_CONOCIMIENTO:
+                lineas = [l for l in rap[campo].split("\n") if l.strip()]
+                for orden, texto in enumerate(lineas, 1):
+                    tablas["conocimientos"].append([
+                        documento_id, codigo_competencia, rap["codigo"], tipo, orden, texto
+                    ])
+
+    for orden, act in enumerate(actividades, 1):
+        tablas["actividades"].append([documento_id, orden, act.get("fase"), act.get("nombre_actividad")])
+        for codigo_rap, denominacion in act.get("raps", []):
+            tablas["actividad_raps"].append([documento_id, orden, codigo_rap, denominacion])
+
+    return tablas
+
+
+def escribir_csv(ruta: str, columnas: list, filas: list):
+    """Escribe una tabla en CSV UTF-8 con encabezado y \\N como nulo"""
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        writer = csv.writer(archivo)
+        writer.writerow([nombre for nombre, _ in columnas])
+        for fila in filas:
+            writer.writerow([NULO_CSV if valor is None else valor for valor in fila])
+
+
+def escribir_parquet(ruta: str, columnas: list, filas: list) -> bool:
+    """Escribe una tabla en Parquet si pyarrow está instalado"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return False
+
+    tipos = {"str": pa.string(), "int": pa.int64()}
+    esquema = pa.schema([(nombre, tipos[tipo]) for nombre, tipo in columnas])
+    datos = {nombre: [fila[i] for fila in filas] for i, (nombre, _) in enumerate(columnas)}
+    pq.write_table(pa.table(datos, schema=esquema), ruta, compression="zstd")
+    return True
+
+
+def exportar_lote(pdf_paths: list, dir_salida: str, formatos=("csv", "parquet")) -> dict:
+    """
+    Extrae un lote de PDFs y escribe una tabla plana por entidad
+    (documentos, competencias, raps, conocimientos, actividades,
+    actividad_raps) en dir_salida
+
+    Returns:
+        dict: {"tablas": {tabla: num_filas}, "archivos": [...], "errores": [...]}
+    """
+    # Importación diferida: solo se carga pdfplumber al exportar
+    from extractors.competencias_extractor import extraer_competencias
+    from extractors.raps_extractor import extraer_raps
+    from extractors.proyecto_extractor import extraer_actividades_proyecto
+
+    os.makedirs(dir_salida, exist_ok=True)
+    tablas = {nombre: [] for nombre in ESQUEMA}
+    errores = []
+
+    for pdf_path in pdf_paths:
+        try:
+            documento_id = calcular_documento_id(pdf_path)
+            filas = filas_documento(
+                documento_id,
+                extraer_competencias(pdf_path),
+                extraer_raps(pdf_path),
+                extraer_actividades_proyecto(pdf_path),
+            )
+        except Exception as e:
+            log_debug(f"Error exportando {pdf_path}: {str(e)}")
+            errores.append({"archivo": pdf_path, "error": str(e)})
+            continue
+
+        tablas["documentos"].append([documento_id, os.path.basename(pdf_path)])
+        for nombre, filas_tabla in filas.items():
+            tablas[nombre].extend(filas_tabla)
+        log_debug(f"Documento exportado: {os.path.basename(pdf_path)} ({documento_id})")
+
+    archivos = []
+    for nombre, columnas in ESQUEMA.items():
+        if "csv" in formatos:
+            ruta = os.path.join(dir_salida, f"{nombre}.csv")
+            escribir_csv(ruta, columnas, tablas[nombre])
+            archivos.append(ruta)
+        if "parquet" in formatos:
+            ruta = os.path.join(dir_salida, f"{nombre}.parquet")
+            if escribir_parquet(ruta, columnas, tablas[nombre]):
+                archivos.append(ruta)
+            else:
+                log_debug("pyarrow no está instalado: se omite la salida Parquet")
+                formatos = [f for f in formatos if f != "parquet"]
+
+    return {
+        "tablas": {nombre: len(filas) for nombre, filas in tablas.items()},
+        "archivos": archivos,
+        "errores": errores,
+    }
+
+
+# === PRUEBA DEL MÓDULO ===
+if __name__ == "__main__":
+    import json
+
+    if len(sys.argv) < 3:
+        print("Uso: python -m exporters.columnar_exporter <dir_salida> <pdf> [<pdf> ...]", file=sys.stderr)
+        sys.exit(1)
+
+    resultado = exportar_lote(sys.argv[2:], sys.argv[1])
+    print(json.dumps(resultado, ensure_ascii=False, indent=2), flush=True)
@@ -0,0 +1,286 @@
+import sqlite3
+import sys
+from utils.pdf_helpers import extraer_numero_horas
+from utils.rap_parser import procesar_competencia, calcular_duracion_por_rap
+
+def log_debug(mensaje):
+    """Enviar logs a stderr para no contaminar stdout"""
+    print(mensaje, file=sys.stderr, flush=True)
+
+# Máximo de filas por INSERT multi-fila (mantiene los parámetros por
+# sentencia muy por debajo de los límites de MySQL y SQLite)
+FILAS_POR_LOTE = 200
+
+# tabla -> (columna id, columnas de datos), en orden de carga padre -> hijo
+TABLAS = {
+    "programa_formacion": ("id_programa", [
+        "codigo_programa", "nombre_programa", "vigencia", "tipo_programa",
+        "version_programa", "horas_totales", "horas_etapa_lectiva", "horas_etapa_productiva",
+    ]),
+    "competencias": ("id_competencia", [
+        "id_programa", "codigo_norma", "nombre_competencia", "unidad_competencia", "duracion_maxima",
+    ]),
+    "raps": ("id_rap", ["id_competencia", "codigo", "denominacion", "duracion"]),
+    "conocimiento_proceso": ("id_conocimiento_proceso", ["id_rap", "nombre"]),
+    "conocimiento_saber": ("id_conocimiento_saber", ["id_rap", "nombre"]),
+    "criterios_evaluacion": ("id_criterio_evaluacion", ["id_rap", "nombre"]),
+}
+
+# Campo de procesar_competencia -> tabla hija de raps
+TABLAS_CONOCIMIENTO = [
+    ("conocimientos_proceso", "conocimiento_proceso"),
+    ("conocimientos_saber", "conocimiento_saber"),
+    ("criterios_evaluacion", "criterios_evaluacion"),
+]
+
+
+class GeneradorIds:
+    """
+    Asigna ids consecutivos por tabla a partir de un id base. La base debe
+    venir de una reserva hecha en la misma transacción que los INSERT
+    (ver cargar_sqlite); no hay valor por defecto porque asumir una tabla
+    vacía choca con los ids de cargas anteriores
+    """
+
+    def __init__(self, ids_base: dict):
+        faltantes = [tabla for tabla in TABLAS if tabla not in ids_base]
+        if faltantes:
+            raise ValueError(f"ids_base sin las tablas: {', '.join(faltantes)}")
+        self.siguientes = {tabla: (ids_base[tabla] or 0) + 1 for tabla in TABLAS}
+
+    def nuevo(self, tabla: str) -> int:
+        id_nuevo = self.siguientes[tabla]
+        self.siguientes[tabla] += 1
+        return id_nuevo
+
+
+def filas_carga(resultado: dict, ids_base: dict) -> dict:
+    """
+    Convierte el resultado de procesar_pdf (programa, competencias,
+    unidadRaps) en filas por tabla con claves generadas en el cliente,
+    manteniendo los enlaces programa -> competencia -> rap -> conocimiento
+
+    Args:
+        resultado: dict "data" de procesar_pdf
+        ids_base: {tabla: último id reservado} para todas las tablas de
+                  TABLAS; los ids nuevos empiezan en base + 1
+    """
+    ids = GeneradorIds(ids_base)
+    filas = {tabla: [] for tabla in TABLAS}
+
+    # === PROGRAMA ===
+    id_programa = None
+    if resultado.get("programa"):
+        prog = resultado["programa"][0]
+        id_programa = ids.nuevo("programa_formacion")
+        filas["programa_formacion"].append([
+            id_programa,
+            prog.get("codigo_programa") or None,
+            prog.get("nombre_programa") or None,
+            prog.get("vigencia") or None,
+            prog.get("tipo") or None,
+            prog.get("version_programa") or None,
+            extraer_numero_horas(prog.get("horas_totales")),
+            extraer_numero_horas(prog.get("horas_etapa_lectiva")),
+            extraer_numero_horas(prog.get("horas_etapa_productiva")),
+        ])
+
+    # === COMPETENCIAS ===
+    competencias = {}
+    for comp in resultado.get("competencias") or []:
+        id_competencia = ids.nuevo("competencias")
+        duracion = extraer_numero_horas(comp.get("duracion_maxima"))
+        competencias.setdefault(comp.get("codigo_norma"), (id_competencia, duracion))
+        filas["competencias"].append([
+            id_competencia,
+            id_programa,
+            comp.get("codigo_norma") or None,
+            comp.get("nombre_competencia") or None,
+            comp.get("unidad_competencia") or None,
+            duracion,
+        ])
+
+    # === RAPs Y CONOCIMIENTOS ===
+    for info_rap in resultado.get("unidadRaps") or []:
+        codigo_competencia = info_rap.get("codigo_competencia")
+        raps = procesar_competencia(info_rap)
+
+        if not raps:
+            log_debug(f"Competencia {codigo_competencia} sin RAPs, saltando...")
+            continue
+        if codigo_competencia not in competencias:
+            log_debug(f"Competencia {codigo_competencia} no encontrada en el documento")
+            continue
+
+        id_competencia, duracion = competencias[codigo_competencia]
+        duracion_por_rap = calcular_duracion_por_rap(duracion, len(raps))
+
+        for rap in raps:
+            id_rap = ids.nuevo("raps")
+            filas["raps"].append([id_rap, id_competencia, rap["codigo"], rap["denominacion"], duracion_por_rap])
+
+            # Un solo registro por RAP y tipo (si hay contenido), igual que el controlador
+            for campo, tabla in TABLAS_CONOCIMIENTO:
+                if rap[campo] and rap[campo].strip():
+                    filas[tabla].append([ids.nuevo(tabla), id_rap, rap[campo]])
+
+    return filas
+
+
+def generar_plan_carga(resultado: dict, ids_base: dict, filas_por_lote: int = FILAS_POR_LOTE) -> list:
+    """
+    Genera el plan de carga masiva: lista de sentencias
+    {"tabla", "sql", "params"} con INSERT multi-fila y placeholders "?"
+    (válidos para mysql2 y sqlite3), en orden padre -> hijo.
+
+    Los ids se generan en el cliente, así que dos cargas simultáneas no
+    pueden partir de la misma base. En MySQL el plan debe ejecutarse así:
+        LOCK TABLES programa_formacion WRITE, competencias WRITE, raps WRITE,
+                    conocimiento_proceso WRITE, conocimiento_saber WRITE,
+                    criterios_evaluacion WRITE;
+        SELECT COALESCE(MAX(id_...), 0) FROM <tabla>;   -- por tabla -> ids_base
+        <sentencias del plan>
+        UNLOCK TABLES;
+    (con InnoDB, SET autocommit = 0 antes del LOCK y COMMIT antes del
+    UNLOCK). Los INSERT con id explícito avanzan AUTO_INCREMENT, así que
+    las inserciones normales del controlador siguen después del rango.
+    En SQLite lo hace cargar_sqlite con BEGIN IMMEDIATE
+    """
+    plan = []
+
+    for tabla, filas_tabla in filas_carga(resultado, ids_base).items():
+        columna_id, columnas = TABLAS[tabla]
+        lista_columnas = ", ".join([columna_id] + columnas)
+        placeholder_fila = "(" + ", ".join(["?"] * (len(columnas) + 1)) + ")"
+
+        for inicio in range(0, len(filas_tabla), filas_por_lote):
+            lote = filas_tabla[inicio:inicio + filas_por_lote]
+            plan.append({
+                "tabla": tabla,
+                "sql": f"INSERT INTO {tabla} ({lista_columnas}) VALUES "
+                       + ", ".join([placeholder_fila] * len(lote)),
+                "params": [valor for fila in lote for valor in fila],
+            })
+
+    return plan
+
+
+def crear_esquema_sqlite(conexion: sqlite3.Connection):
+    """Crea las tablas del plan en SQLite (sustituto local de MySQL)"""
+    conexion.execute("PRAGMA foreign_keys = ON")
+    conexion.executescript("""
+        CREATE TABLE programa_formacion (
+            id_programa INTEGER PRIMARY KEY, codigo_programa TEXT, nombre_programa TEXT NOT NULL,
+            vigencia TEXT, tipo_programa TEXT, version_programa TEXT, horas_totales INTEGER,
+            horas_etapa_lectiva INTEGER, horas_etapa_productiva INTEGER
+        );
+        CREATE TABLE competencias (
+            id_competencia INTEGER PRIMARY KEY,
+            id_programa INTEGER REFERENCES programa_formacion (id_programa),
+            codigo_norma TEXT, duracion_maxima INTEGER, nombre_competencia TEXT, unidad_competencia TEXT
+        );
+        CREATE TABLE raps (
+            id_rap INTEGER PRIMARY KEY, id_competencia INTEGER REFERENCES competencias (id_competencia),
+            denominacion TEXT, duracion INTEGER, codigo TEXT
+        );
+        CREATE TABLE conocimiento_proceso (
+            id_conocimiento_proceso INTEGER PRIMARY KEY,
+            id_rap INTEGER REFERENCES raps (id_rap), nombre TEXT NOT NULL
+        );
+        CREATE TABLE conocimiento_saber (
+            id_conocimiento_saber INTEGER PRIMARY KEY,
+            id_rap INTEGER REFERENCES raps (id_rap), nombre TEXT NOT NULL
+        );
+        CREATE TABLE criterios_evaluacion (
+            id_criterio_evaluacion INTEGER PRIMARY KEY,
+            id_rap INTEGER REFERENCES raps (id_rap), nombre TEXT NOT NULL
+        );
+    """)
+
+
+def ids_base_sqlite(conexion: sqlite3.Connection) -> dict:
+    """Último id de cada tabla del plan (0 si está vacía)"""
+    return {
+        tabla: conexion.execute(f"SELECT COALESCE(MAX({columna_id}), 0) FROM {tabla}").fetchone()[0]
+        for tabla, (columna_id, _) in TABLAS.items()
+    }
+
+
+def cargar_sqlite(resultado: dict, conexion: sqlite3.Connection, filas_por_lote: int = FILAS_POR_LOTE) -> dict:
+    """
+    Reserva los ids y ejecuta el plan en una sola transacción: BEGIN
+    IMMEDIATE toma el bloqueo de escritura antes de leer los MAX(id), así
+    otra carga no puede leer la misma base hasta el COMMIT
+
+    Returns:
+        dict: {"ids_base", "sentencias"}
+    """
+    conexion.execute("BEGIN IMMEDIATE")
+    try:
+        ids_base = ids_base_sqlite(conexion)
+        plan = generar_plan_carga(resultado, ids_base, filas_por_lote)
+        for sentencia in plan:
+            conexion.execute(sentencia["sql"], sentencia["params"])
+        conexion.commit()
+    except Exception:
+        conexion.rollback()
+        raise
+
+    return {"ids_base": ids_base, "sentencias": len(plan)}
+
+
+def ejecutar_plan_sqlite(plan: list, conexion=None) -> dict:
+    """
+    Ejecuta el plan en una transacción SQLite y retorna filas por tabla,
+    número de sentencias y violaciones de llaves foráneas
+    """
+    if conexion is None:
+        conexion = sqlite3.connect(":memory:")
+        crear_esquema_sqlite(conexion)
+
+    with conexion:
+        for sentencia in plan:
+            conexion.execute(sentencia["sql"], sentencia["params"])
+
+    return {
+        "sentencias": len(plan),
+        "filas": {
+            tabla: conexion.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+            for tabla in TABLAS
+        },
+        "violaciones_fk": conexion.execute("PRAGMA foreign_key_check").fetchall(),
+    }
+
+
+# === PRUEBA DEL MÓDULO ===
+if __name__ == "__main__":
+    import json
+    import os
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from main import configurar_utf8, procesar_pdf
+
+    configurar_utf8()
+
+    if len(sys.argv) < 2:
+        print("Uso: python -m exporters.sql_exporter <ruta_pdf> [--sqlite | --ids-base <json>]",
+              file=sys.stderr)
+        sys.exit(1)
+
+    respuesta = procesar_pdf(sys.argv[1], "todo")
+    if not respuesta["success"]:
+        print(json.dumps(respuesta, ensure_ascii=False, indent=2))
+        sys.exit(1)
+
+    if "--sqlite" in sys.argv:
+        conexion = sqlite3.connect(":memory:")
+        crear_esquema_sqlite(conexion)
+        carga = cargar_sqlite(respuesta["data"], conexion)
+        print(json.dumps({**ejecutar_plan_sqlite([], conexion), **carga}, ensure_ascii=False, indent=2))
+    else:
+        # Sin --ids-base se asume una base vacía (útil solo para inspeccionar el plan)
+        ids_base = {tabla: 0 for tabla in TABLAS}
+        if "--ids-base" in sys.argv:
+            ids_base.update(json.loads(sys.argv[sys.argv.index("--ids-base") + 1]))
+        plan = generar_plan_carga(respuesta["data"], ids_base)
+        print(json.dumps({"success": True, "ids_base": ids_base, "plan": plan}, ensure_ascii=False, indent=2))
@@ -0,0 +1,102 @@
+from functools import cached_property
+from utils.cache_filas import obtener_paginas
+from utils.pdf_helpers import norm
+
+# Bus de filas: recorre las tablas del documento una sola vez y entrega
+# cada fila a todos los manejadores (máquinas de estado) activos. Los
+# textos derivados de la fila se calculan una vez y se comparten.
+
+
+class Fila:
+    """Fila de una tabla con sus textos derivados calculados bajo demanda"""
+
+    def __init__(self, num_pagina: int, celdas):
+        self.num_pagina = num_pagina
+        self.celdas = celdas
+
+    @cached_property
+    def celda_izq(self) -> str:
+        """Primera celda normalizada"""
+        return norm(self.celdas[0] or "")
+
+    @cached_property
+    def texto(self) -> str:
+        """Celdas no vacías (cada una sin espacios extremos) unidas con espacio"""
+        return " ".join([str(c).strip() for c in self.celdas if c]).strip()
+
+    @cached_property
+    def texto_norm(self) -> str:
+        return norm(self.texto)
+
+    @cached_property
+    def texto_crudo(self) -> str:
+        """Celdas no vacías unidas con espacio, sin recortarlas"""
+        return " ".join([c for c in self.celdas if c]).strip()
+
+    @cached_property
+    def texto_crudo_norm(self) -> str:
+        return norm(self.texto_crudo)
+
+    @cached_property
+    def texto_pegado(self) -> str:
+        """Celdas no vacías unidas sin separador"""
+        return "".join([c for c in self.celdas if c]).strip()
+
+    @cached_property
+    def texto_pegado_norm(self) -> str:
+        return norm(self.texto_pegado)
+
+    @cached_property
+    def vacia(self) -> bool:
+        """Sin celdas o con todas las celdas en blanco"""
+        return not self.celdas or all(c is None or c.strip() == "" for c in self.celdas)
+
+
+class ManejadorFilas:
+    """
+    Máquina de estado de un extractor. El bus llama a inicio_pagina,
+    inicio_tabla y procesar_fila en orden; al terminar, resultado().
+    Un manejador puede poner saltar_tabla = True para ignorar el resto
+    de la tabla actual (equivale al "break" del recorrido original).
+    """
+
+    saltar_tabla = False
+
+    def inicio_pagina(self, num_pagina: int):
+        pass
+
+    def inicio_tabla(self):
+        self.saltar_tabla = False
+
+    def procesar_fila(self, fila: Fila):
+        raise NotImplementedError
+
+    def resultado(self):
+        raise NotImplementedError
+
+
+def recorrer_filas(pdf_path: str, manejadores: list, paginas=None) -> list:
+    """
+    Recorre todas las filas del documento una vez, entregándolas a cada
+    manejador. Retorna los resultados en el orden de los manejadores.
+    Si se reciben las páginas ya extraídas ([(num_pagina, tablas)]) no se
+    lee el PDF ni la cache.
+    """
+    if paginas is None:
+        paginas = obtener_paginas(pdf_path)
+
+    for num_pagina, tablas in paginas:
+        for manejador in manejadores:
+            manejador.inicio_pagina(num_pagina)
+
+        for tabla in tablas:
+            for manejador in manejadores:
+                manejador.inicio_tabla()
+
+            for celdas in tabla:
+                fila = Fila(num_pagina, celdas)
+                for manejador in manejadores:
+                    if not manejador.saltar_tabla:
+                        manejador.procesar_fila(fila)
+
+    return [manejador.resultado() for manejador in manejadores]
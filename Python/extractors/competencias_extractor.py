@@ -1,78 +1,82 @@
-import pdfplumber
-import re
 import sys
+from extractors.bus_filas import Fila, ManejadorFilas, recorrer_filas
 from utils.pdf_helpers import norm
+from utils.patrones import (
+    COMPETENCIA_UNIDAD, COMPETENCIA_CODIGO, COMPETENCIA_NOMBRE, COMPETENCIA_HORA,
+    ETAPA_PRACTICA, CODIGO_ETAPA_PRACTICA, HORA_RE
+)
 
 def log_debug(mensaje):
     """Enviar logs a stderr para no contaminar stdout"""
     print(mensaje, file=sys.stderr, flush=True)
 
-def extraer_competencias(pdf_path: str) -> list:
-    TARGET_COMPETENCIA = "UNIDAD DE COMPETENCIA"
-    TARGET_CODIGO = "CODIGO NORMA DE COMPETENCIA LABORAL"
-    TARGET_NOMBRE = "NOMBRE DE LA COMPETENCIA"
-    TARGET_HORA = "DURACION MAXIMA ESTIMADA"
-    
-    HORA_RE = re.compile(r"\b(\d{1,4})\s*(HORA|HORAS)\b", re.IGNORECASE)
-    
-    registros = []
-    registro_actual = {}
-    dentro_de_etapa_practica = False
+class ManejadorCompetencias(ManejadorFilas):
+    """Máquina de estado de extraer_competencias"""
+
+    def __init__(self):
+        self.registros = []
+        self.registro_actual = {}
+        self.dentro_de_etapa_practica = False
+
+    def procesar_fila(self, fila: Fila):
+        celdas = fila.celdas
+        if not celdas or len(celdas) < 2:
+            return
+
+        celda_izq = fila.celda_izq
+        texto_fila = fila.texto_pegado
+        texto_norm = fila.texto_pegado_norm
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            tablas = page.extract_tables()
-            for tabla in tablas:
-                for fila in tabla:
-                    if fila and len(fila) >= 2:
-                        celda_izq = norm(fila[0] or "")
-                        texto_fila = "".join([c for c in fila if c]).strip()
-                        texto_norm = norm(texto_fila)
-                        
-                        # Detectar etapa práctica
-                        if "ETAPA PRACTICA" in texto_norm or "999999999" in texto_fila:
-                            dentro_de_etapa_practica = True
-                            if registro_actual:
-                                registros.append(registro_actual)
-                                registro_actual = {}
-                            continue
-                        
-                        if dentro_de_etapa_practica:
-                            if TARGET_CODIGO in celda_izq and "999999999" not in texto_fila:
-                                dentro_de_etapa_practica = False
-                            else:
-                                continue
+        # Detectar etapa práctica
+        if ETAPA_PRACTICA in texto_norm or CODIGO_ETAPA_PRACTICA in texto_fila:
+            self.dentro_de_etapa_practica = True
+            if self.registro_actual:
+                self.registros.append(self.registro_actual)
+                self.registro_actual = {}
+            return
 
-                        # Competencia
-                        if TARGET_COMPETENCIA in celda_izq:
-                            if registro_actual:
-                                registros.append(registro_actual)
-                                log_debug(f"✅ Competencia guardada: {registro_actual.get('nombre_competencia', 'sin nombre')}")
-                                registro_actual = {}
-                            registro_actual["unidad_competencia"] = (norm(fila[1] or ""))
+        if self.dentro_de_etapa_practica:
+            if COMPETENCIA_CODIGO in celda_izq and CODIGO_ETAPA_PRACTICA not in texto_fila:
+                self.dentro_de_etapa_practica = False
+            else:
+                return
 
-                        # Código
-                        elif TARGET_CODIGO in celda_izq:
-                            registro_actual["codigo_norma"] = (fila[1] or "").strip()
+        # Competencia
+        if COMPETENCIA_UNIDAD in celda_izq:
+            if self.registro_actual:
+                self.registros.append(self.registro_actual)
+                log_debug(f"✅ Competencia guardada: {self.registro_actual.get('nombre_competencia', 'sin nombre')}")
+                self.registro_actual = {}
+            self.registro_actual["unidad_competencia"] = (norm(celdas[1] or ""))
 
-                        # Nombre
-                        elif TARGET_NOMBRE in celda_izq:
-                            registro_actual["nombre_competencia"] = (norm(fila[1] or ""))
+        # Código
+        elif COMPETENCIA_CODIGO in celda_izq:
+            self.registro_actual["codigo_norma"] = (celdas[1] or "").strip()
 
-                        # Horas
-                        elif TARGET_HORA in celda_izq:
-                            for celda in fila:
-                                if celda and HORA_RE.search(str(celda)):
-                                    if not registro_actual:
-                                        # Ignorar horas sueltas (como la de 3120 horas inicial)
-                                        log_debug(f"[P{page.page_number}] ⏭ Ignorando hora fuera de competencia: {celda}")
-                                        continue
-                                    registro_actual["duracion_maxima"] = str(celda).strip()
-                                    break
+        # Nombre
+        elif COMPETENCIA_NOMBRE in celda_izq:
+            self.registro_actual["nombre_competencia"] = (norm(celdas[1] or ""))
 
-    # Guardar último registro
-    if registro_actual:
-        registros.append(registro_actual)
-        log_debug(f"✅ Última competencia guardada: {registro_actual.get('nombre_competencia', 'sin nombre')}")
+        # Horas
+        elif COMPETENCIA_HORA in celda_izq:
+            for celda in celdas:
+                if celda and HORA_RE.search(str(celda)):
+                    if not self.registro_actual:
+                        # Ignorar horas sueltas (como la de 3120 horas inicial)
+                        log_debug(f"[P{fila.num_pagina}] ⏭ Ignorando hora fuera de competencia: {celda}")
+                        continue
+                    self.registro_actual["duracion_maxima"] = str(celda).strip()
+                    break
 
-    return registros
\ No newline at end of file
+    def resultado(self) -> list:
+        # Guardar último registro
+        if self.registro_actual:
+            self.registros.append(self.registro_actual)
+            log_debug(f"✅ Última competencia guardada: {self.registro_actual.get('nombre_competencia', 'sin nombre')}")
+
+        return self.registros
+
+
+def extraer_competencias(pdf_path: str) -> list:
+    """Extrae las competencias del programa (sin la etapa práctica)"""
+    return recorrer_filas(pdf_path, [ManejadorCompetencias()])[0]
@@ -1,64 +1,159 @@
-import pdfplumber
-import re
 import sys
-import unicodedata
+from extractors.bus_filas import Fila, ManejadorFilas, recorrer_filas
+from utils.pdf_helpers import norm
+from utils.patrones import (
+    COMPETENCIA_UNIDAD, COMPETENCIA_CODIGO, COMPETENCIA_NOMBRE, COMPETENCIA_RESULTADOS,
+    COMPETENCIA_CONOCIMIENTOS_PROCESO, COMPETENCIA_CRITERIOS_EVALUACION,
+    COMPETENCIA_CONOCIMIENTOS_SABER, CODIGO_ETAPA_PRACTICA, IGNORE_KEYS,
+    FIN_SECCION_RE, RAP_CONOCIMIENTOS_RE
+)
 
 def log_debug(mensaje):
     """Enviar logs a stderr para no contaminar stdout"""
     print(mensaje, file=sys.stderr, flush=True)
 
 
-def strip_accents(s: str) -> str:
-    """Eliminar acentos de un texto"""
-    return ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
-
-
-def norm(s: str) -> str:
-    """Normalizar texto: sin acentos, mayúsculas, espacios limpios"""
-    s = strip_accents(s or "").upper()
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
-
-
-# === PALABRAS CLAVE ===
-TARGET_COMPETENCIA = "UNIDAD DE COMPETENCIA"
-TARGET_CODIGO = "CODIGO NORMA DE COMPETENCIA LABORAL"
-TARGET_NOMBRE = "NOMBRE DE LA COMPETENCIA"
-TARGET_HORA = "DURACION MAXIMA ESTIMADA"
-TARGET_RESULTADOS = "RESULTADOS DE APRENDIZAJE"
-TARGET_CONOCIMIENTOS_PROCESO = "CONOCIMIENTOS DE PROCESO"
-TARGET_CRITERIOS_EVALUACION = "CRITERIOS DE EVALUACION"
-TARGET_CONOCIMIENTOS_SABER = "CONOCIMIENTOS DEL SABER"
-
-IGNORE_KEYS = [
-    "LINEA TECNOLOGICA",
-    "RED TECNOLOGICA",
-    "RED DE CONOCIMIENTO",
-    "DENOMINACION"
-]
-
-# Patrones de fin de sección
-FIN_SECCION_PATTERNS = [
-    r"PERFIL DEL INSTRUCTOR",
-    r"REQUISITOS ACADEMICOS",
-    r"4\.8\s+PERFIL",
-    r"4\.8\.1",
-    r"CONTENIDOS CURRICULARES DE LA COMPETENCIA"
-]
-
-
 def es_fin_seccion(texto):
     """Detecta si llegamos al final de la sección"""
-    texto_norm = norm(texto)
-    for pattern in FIN_SECCION_PATTERNS:
-        if re.search(pattern, texto_norm):
-            return True
-    return False
+    return bool(FIN_SECCION_RE.search(norm(texto)))
+
+
+def cerrar_registro(registro: dict) -> dict:
+    """Limpia los resultados y convierte las listas a texto antes de guardar"""
+    # Limpiar posibles líneas erróneas dentro de los resultados
+    if "resultados_aprendizaje" in registro:
+        registro["resultados_aprendizaje"] = [
+            r for r in registro["resultados_aprendizaje"]
+            if not RAP_CONOCIMIENTOS_RE.search(norm(r))
+        ]
+    # Convertir listas a texto
+    for campo in ("conocimientos_proceso", "conocimientos_saber", "criterios_evaluacion"):
+        if campo in registro and isinstance(registro[campo], list):
+            registro[campo] = "\n".join(registro[campo])
+    return registro
+
+
+class ManejadorRaps(ManejadorFilas):
+    """Máquina de estado de extraer_raps"""
+
+    def __init__(self):
+        self.resultados = []
+        self.registro_actual = {}
+
+        # Flags de captura
+        self.capturando_resultados = False
+        self.capturando_conocimientos = False
+        self.capturando_criterios = False
+        self.capturando_saber = False
+
+    def capturar(self, resultados=False, conocimientos=False, criterios=False, saber=False):
+        self.capturando_resultados = resultados
+        self.capturando_conocimientos = conocimientos
+        self.capturando_criterios = criterios
+        self.capturando_saber = saber
+
+    def inicio_pagina(self, num_pagina: int):
+        log_debug(f"Procesando página {num_pagina}")
+
+    def procesar_fila(self, fila: Fila):
+        celdas = fila.celdas
+        if not celdas or not any(celdas):
+            return
+
+        fila_texto = fila.texto_crudo
+        fila_norm = fila.texto_crudo_norm
+        celda_izq = fila.celda_izq
+        registro_actual = self.registro_actual
+
+        # === IGNORAR ENCABEZADOS ===
+        if any(key in fila_norm for key in IGNORE_KEYS):
+            return
+
+        # === DETECTAR NUEVA COMPETENCIA ===
+        if COMPETENCIA_UNIDAD in celda_izq:
+            # Guardar registro anterior si existe
+            if registro_actual:
+                self.resultados.append(cerrar_registro(registro_actual))
+                log_debug(f"Competencia guardada: {registro_actual.get('codigo_competencia')}")
+
+            # Iniciar nuevo registro
+            self.registro_actual = {"competencia": (celdas[1] or "").strip()}
+            self.capturar()
+            return
+
+        # === CAPTURAR CÓDIGO ===
+        if COMPETENCIA_CODIGO in celda_izq:
+            codigo = (celdas[1] or "").strip()
+            if codigo and codigo != CODIGO_ETAPA_PRACTICA:  # Ignorar etapa práctica
+                registro_actual["codigo_competencia"] = codigo
+                log_debug(f"Código: {codigo}")
+            return
+
+        # === CAPTURAR NOMBRE ===
+        if COMPETENCIA_NOMBRE in celda_izq:
+            registro_actual["competencia"] = (celdas[1] or "").strip()
+            return
+
+        # === DETECTAR FIN DE SECCIÓN ===
+        if FIN_SECCION_RE.search(fila_norm):
+            self.capturar()
+            return
+
+        # === CAMBIAR SECCIÓN ===
+        if COMPETENCIA_RESULTADOS in celda_izq:
+            self.capturar(resultados=True)
+            registro_actual["resultados_aprendizaje"] = [] # type: ignore
+            log_debug("Capturando Resultados de Aprendizaje")
+            return
+
+        if COMPETENCIA_CONOCIMIENTOS_PROCESO in celda_izq:
+            self.capturar(conocimientos=True)
+            registro_actual["conocimientos_proceso"] = [] # type: ignore
+            log_debug("Capturando Conocimientos de Proceso")
+            return
+
+        if COMPETENCIA_CRITERIOS_EVALUACION in celda_izq:
+            self.capturar(criterios=True)
+            registro_actual["criterios_evaluacion"] = [] # type: ignore
+            log_debug("Capturando Criterios de Evaluación")
+            return
+
+        if COMPETENCIA_CONOCIMIENTOS_SABER in celda_izq:
+            self.capturar(saber=True)
+            registro_actual["conocimientos_saber"] = [] # type: ignore
+            log_debug("Capturando Conocimientos del Saber")
+            return
+
+        # === CAPTURAR CONTENIDO ===
+        if not fila_texto.strip():
+            return
+
+        if self.capturando_resultados:
+            registro_actual.setdefault("resultados_aprendizaje", []).append(fila_texto) # type: ignore
+
+        elif self.capturando_conocimientos:
+            registro_actual.setdefault("conocimientos_proceso", []).append(fila_texto) # type: ignore
+
+        elif self.capturando_criterios:
+            registro_actual.setdefault("criterios_evaluacion", []).append(fila_texto) # type: ignore
+
+        elif self.capturando_saber:
+            registro_actual.setdefault("conocimientos_saber", []).append(fila_texto) # type: ignore
+
+    def resultado(self) -> list:
+        # === GUARDAR EL ÚLTIMO REGISTRO ===
+        if self.registro_actual and self.registro_actual.get("codigo_competencia"):
+            self.resultados.append(cerrar_registro(self.registro_actual))
+            log_debug(f"Última competencia guardada: {self.registro_actual.get('codigo_competencia')}")
+
+        log_debug(f"\nTotal competencias extraídas: {len(self.resultados)}")
+
+        return self.resultados
 
 
 def extraer_raps(pdf_path: str) -> list:
     """
-    Extrae RAPs del PDF del programa SENA en el formato correcto
+    Extrae RAPs del PDF del programa SENA en el formato correcto.
     
     Returns:
         list: Lista de diccionarios con estructura:
@@ -71,159 +166,9 @@ def extraer_raps(pdf_path: str) -> list:
             "criterios_evaluacion": "texto con saltos de línea"
         }
     """
-    
-    resultados = []
-    registro_actual = {}
-    
-    # Flags de captura
-    capturando_resultados = False
-    capturando_conocimientos = False
-    capturando_criterios = False
-    capturando_saber = False
-    
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for num_pagina, page in enumerate(pdf.pages, 1):
-                log_debug(f"Procesando página {num_pagina}")
-                
-                tablas = page.extract_tables()
-                
-                for tabla in tablas:
-                    for fila in tabla:
-                        if not fila or not any(fila):
-                            continue
-                        
-                        fila_texto = " ".join([c for c in fila if c]).strip()
-                        fila_norm = norm(fila_texto)
-                        celda_izq = norm(fila[0] or "")
-                        
-                        # === IGNORAR ENCABEZADOS ===
-                        if any(key in fila_norm for key in IGNORE_KEYS):
-                            continue
-                        
-                        # === DETECTAR NUEVA COMPETENCIA ===
-                        if TARGET_COMPETENCIA in celda_izq:
-                            # Guardar registro anterior si existe
-                            if registro_actual:
-                                    # Limpiar posibles líneas erróneas dentro de los resultados
-                                if "resultados_aprendizaje" in registro_actual:
-                                        registro_actual["resultados_aprendizaje"] = [ # type: ignore
-                                            r for r in registro_actual["resultados_aprendizaje"]
-                                            if not re.search(r"^\s*4\.6\s*CONOCIMIENTOS", norm(r))
-                                        ] 
-                                # Convertir listas a texto antes de guardar
-                                if "conocimientos_proceso" in registro_actual and isinstance(registro_actual["conocimientos_proceso"], list):
-                                    registro_actual["conocimientos_proceso"] = "\n".join(registro_actual["conocimientos_proceso"])
-                                if "conocimientos_saber" in registro_actual and isinstance(registro_actual["conocimientos_saber"], list):
-                                    registro_actual["conocimientos_saber"] = "\n".join(registro_actual["conocimientos_saber"])
-                                if "criterios_evaluacion" in registro_actual and isinstance(registro_actual["criterios_evaluacion"], list):
-                                    registro_actual["criterios_evaluacion"] = "\n".join(registro_actual["criterios_evaluacion"])
-                                
-                                resultados.append(registro_actual)
-                                log_debug(f"Competencia guardada: {registro_actual.get('codigo_competencia')}")
-                            
-                            # Iniciar nuevo registro
-                            registro_actual = {"competencia": (fila[1] or "").strip()}
-                            capturando_resultados = False
-                            capturando_conocimientos = False
-                            capturando_criterios = False
-                            capturando_saber = False
-                            continue
-                        
-                        # === CAPTURAR CÓDIGO ===
-                        if TARGET_CODIGO in celda_izq:
-                            codigo = (fila[1] or "").strip()
-                            if codigo and codigo != "999999999":  # Ignorar etapa práctica
-                                registro_actual["codigo_competencia"] = codigo
-                                log_debug(f"Código: {codigo}")
-                            continue
-                        
-                        # === CAPTURAR NOMBRE ===
-                        if TARGET_NOMBRE in celda_izq:
-                            registro_actual["competencia"] = (fila[1] or "").strip()
-                            continue
-                        
-                        # === DETECTAR FIN DE SECCIÓN ===
-                        if es_fin_seccion(fila_texto):
-                            capturando_resultados = False
-                            capturando_conocimientos = False
-                            capturando_criterios = False
-                            capturando_saber = False
-                            continue
-                        
-                        # === CAMBIAR SECCIÓN ===
-                        if TARGET_RESULTADOS in celda_izq:
-                            capturando_resultados = True
-                            capturando_conocimientos = False
-                            capturando_criterios = False
-                            capturando_saber = False
-                            registro_actual["resultados_aprendizaje"] = [] # type: ignore
-                            log_debug("Capturando Resultados de Aprendizaje")
-                            continue
-                        
-                        if TARGET_CONOCIMIENTOS_PROCESO in celda_izq:
-                            capturando_conocimientos = True
-                            capturando_resultados = False
-                            capturando_criterios = False
-                            capturando_saber = False
-                            registro_actual["conocimientos_proceso"] = [] # type: ignore
-                            log_debug("Capturando Conocimientos de Proceso")
-                            continue
-                        
-                        if TARGET_CRITERIOS_EVALUACION in celda_izq:
-                            capturando_criterios = True
-                            capturando_resultados = False
-                            capturando_conocimientos = False
-                            capturando_saber = False
-                            registro_actual["criterios_evaluacion"] = [] # type: ignore
-                            log_debug("Capturando Criterios de Evaluación")
-                            continue
-                        
-                        if TARGET_CONOCIMIENTOS_SABER in celda_izq:
-                            capturando_saber = True
-                            capturando_resultados = False
-                            capturando_conocimientos = False
-                            capturando_criterios = False
-                            registro_actual["conocimientos_saber"] = [] # type: ignore
-                            log_debug("Capturando Conocimientos del Saber")
-                            continue
-                        
-                        # === CAPTURAR CONTENIDO ===
-                        if capturando_resultados and fila_texto.strip():
-                            registro_actual.setdefault("resultados_aprendizaje", []).append(fila_texto) # type: ignore
-                        
-                        elif capturando_conocimientos and fila_texto.strip():
-                            registro_actual.setdefault("conocimientos_proceso", []).append(fila_texto) # type: ignore
-                        
-                        elif capturando_criterios and fila_texto.strip():
-                            registro_actual.setdefault("criterios_evaluacion", []).append(fila_texto) # type: ignore
-                        
-                        elif capturando_saber and fila_texto.strip():
-                            registro_actual.setdefault("conocimientos_saber", []).append(fila_texto) # type: ignore
-        
-        # === GUARDAR EL ÚLTIMO REGISTRO ===
-        if registro_actual and registro_actual.get("codigo_competencia"):
-            # Limpiar posibles líneas erróneas dentro de los resultados
-            if "resultados_aprendizaje" in registro_actual:
-                registro_actual["resultados_aprendizaje"] = [ # type: ignore
-                    r for r in registro_actual["resultados_aprendizaje"]
-                    if not re.search(r"^\s*4\.6\s*CONOCIMIENTOS", norm(r))
-                    ]
-            # Convertir listas a texto
-            if "conocimientos_proceso" in registro_actual and isinstance(registro_actual["conocimientos_proceso"], list):
-                registro_actual["conocimientos_proceso"] = "\n".join(registro_actual["conocimientos_proceso"])
-            if "conocimientos_saber" in registro_actual and isinstance(registro_actual["conocimientos_saber"], list):
-                registro_actual["conocimientos_saber"] = "\n".join(registro_actual["conocimientos_saber"])
-            if "criterios_evaluacion" in registro_actual and isinstance(registro_actual["criterios_evaluacion"], list):
-                registro_actual["criterios_evaluacion"] = "\n".join(registro_actual["criterios_evaluacion"])
-            
-            resultados.append(registro_actual)
-            log_debug(f"Última competencia guardada: {registro_actual.get('codigo_competencia')}")
-        
-        log_debug(f"\nTotal competencias extraídas: {len(resultados)}")
-        
-        return resultados
-    
+        return recorrer_filas(pdf_path, [ManejadorRaps()])[0]
+
     except Exception as e:
         log_debug(f"Error en extracción: {str(e)}")
         import traceback
@@ -1,57 +1,83 @@
 import sys
 import json
 import os
-from extractors.programa_extractor import extraer_programa
-from extractors.competencias_extractor import extraer_competencias
-from extractors.raps_extractor import extraer_raps 
-from extractors.proyecto_extractor import extraer_proyecto, extraer_fases_proyecto, extraer_actividades_proyecto
+from importlib import import_module
 
-# Configurar UTF-8
-if sys.stdout.encoding != 'utf-8':
-    sys.stdout.reconfigure(encoding='utf-8') # type: ignore
-if sys.stderr.encoding != 'utf-8':
-    sys.stderr.reconfigure(encoding='utf-8') # type: ignore
+# tipo -> (clave en el resultado, módulo, manejador)
+# Los extractores se importan solo cuando el tipo los pide, así un tipo
+# como "fases" no paga la importación de los demás módulos. Cada
+# manejador es la máquina de estado del extractor (extractors.bus_filas).
+EXTRACTORES = [
+    ('programa', 'programa', 'extractors.programa_extractor', 'ManejadorPrograma'),
+    ('competencias', 'competencias', 'extractors.competencias_extractor', 'ManejadorCompetencias'),
+    ('raps', 'unidadRaps', 'extractors.raps_extractor', 'ManejadorRaps'),
+    ('proyecto', 'proyecto', 'extractors.proyecto_extractor', 'ManejadorProyecto'),
+    ('fases', 'fases', 'extractors.proyecto_extractor', 'ManejadorFases'),
+    ('actividades', 'actividades', 'extractors.proyecto_extractor', 'ManejadorActividades'),
+]
 
-os.environ['PYTHONIOENCODING'] = 'utf-8'
+def configurar_utf8():
+    """Configura stdout/stderr en UTF-8 (solo al ejecutar como script)"""
+    if sys.stdout.encoding != 'utf-8':
+        sys.stdout.reconfigure(encoding='utf-8') # type: ignore
+    if sys.stderr.encoding != 'utf-8':
+        sys.stderr.reconfigure(encoding='utf-8') # type: ignore
 
-def procesar_pdf(pdf_path: str, tipo: str) -> dict:
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+def cargar_extractor(modulo: str, manejador: str):
+    """Importa el módulo del extractor bajo demanda y retorna la clase del manejador"""
+    return getattr(import_module(modulo), manejador)
+
+def extractores_para(tipo: str) -> list:
+    """Lista de (clave, módulo, manejador) que corresponden al tipo pedido"""
+    return [
+        (clave, modulo, manejador)
+        for nombre, clave, modulo, manejador in EXTRACTORES
+        if tipo in [nombre, 'todo']
+    ]
+
+def precargar(tipo: str = 'todo'):
+    """Importa por adelantado los extractores de un tipo y pdfplumber (usado por el zygote)"""
+    extractores = extractores_para(tipo)
+    for _, modulo, manejador in extractores:
+        cargar_extractor(modulo, manejador)
+
+    # Todos los extractores leen las filas con pdfplumber (utils.cache_filas)
+    if extractores:
+        from utils.cache_filas import precargar_pdf
+        precargar_pdf()
+
+def procesar_pdf(pdf_path: str, tipo: str, paginas=None) -> dict:
     """
     Procesa un PDF y extrae información según el tipo
     Args:
         pdf_path: Ruta absoluta al PDF
-        tipo: 'programa', 'competencias', 'todo'
+        tipo: 'programa', 'competencias', 'raps', 'proyecto', 'fases',
+              'actividades', 'todo'
+        paginas: Filas ya extraídas [(num_pagina, tablas)] (opcional)
     """
 
-    resultado = {}
-
     try:
-        if tipo in ['programa', 'todo']:
-            resultado['programa'] = extraer_programa(pdf_path)
-            
-        if tipo in ['competencias', 'todo']:
-            resultado['competencias'] = extraer_competencias(pdf_path)
-        
-        if tipo in ['raps', 'todo']:
-            resultado['unidadRaps'] = extraer_raps(pdf_path)
-            
-        if tipo in ['proyecto', 'todo']:
-            resultado['proyecto'] = extraer_proyecto(pdf_path)
-            
-        if tipo in ['fases','todo']:
-            resultado['fases'] = extraer_fases_proyecto(pdf_path)
-            
-        if tipo in ['actividades', 'todo']:
-            resultado['actividades'] = extraer_actividades_proyecto(pdf_path)
-            
+        from extractors.bus_filas import recorrer_filas
+
+        # Un solo recorrido de las filas alimenta a todos los manejadores
+        extractores = extractores_para(tipo)
+        manejadores = [cargar_extractor(modulo, manejador)() for _, modulo, manejador in extractores]
+        resultados = recorrer_filas(pdf_path, manejadores, paginas) if manejadores else []
+
+        resultado = {clave: valor for (clave, _, _), valor in zip(extractores, resultados)}
         return {"success": True, "data": resultado}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 if __name__ == "__main__":
+    configurar_utf8()
+
     if len(sys.argv) < 3:
         print(json.dumps({
-            "success": False, 
-            "error": "Uso: python main.py <ruta_pdf> <tipo>"
+            "success": False,
+            "error": "Uso: python main.py <ruta_pdf> <tipo> [--mmap]"
         }))
         sys.exit(1)
 
@@ -59,4 +85,11 @@ if __name__ == "__main__":
     tipo = sys.argv[2]
 
     resultado = procesar_pdf(pdf_path, tipo)
-    print(json.dumps(resultado, ensure_ascii=False, indent=2))
\ No newline at end of file
+
+    # --mmap: el JSON compacto queda en un archivo mapeado y por stdout
+    # solo sale {"success", "handle", "longitud"} (utils.entrega_resultado)
+    if '--mmap' in sys.argv[3:] and resultado["success"]:
+        from utils.entrega_resultado import escribir_resultado
+        print(json.dumps({"success": True, **escribir_resultado(resultado)}, ensure_ascii=False))
+    else:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
@@ -0,0 +1,259 @@
+import sys
+import numpy as np
+
+def log_debug(mensaje):
+    """Enviar logs a stderr para no contaminar stdout"""
+    print(mensaje, file=sys.stderr, flush=True)
+
+# Semanas lectivas por trimestre (mismo divisor que recalcular_horas_rap)
+SEMANAS_TRIMESTRE = 11
+
+# Carga semanal máxima de una ficha antes de marcar alerta
+MAX_HORAS_SEMANA = 40
+
+# Modo "balanceado": pasadas máximas y cambio (horas) con el que se da por estable
+PASADAS_BALANCEO = 50
+TOLERANCIA_BALANCEO = 1e-6
+
+
+def llenar_nivel(base, semanas, horas: float):
+    """
+    Reparte horas entre trimestres subiendo primero los de menor carga
+    semanal (llenado por niveles): cada trimestre que recibe horas queda
+    en la misma carga semanal y los que no reciben ya estaban por encima
+
+    Args:
+        base: (K,) carga semanal de cada trimestre sin este RAP
+        semanas: (K,) semanas de cada trimestre
+        horas: horas a repartir
+
+    Returns:
+        (K,) horas asignadas a cada trimestre
+    """
+    orden = np.argsort(base)
+    base_ordenada, semanas_ordenadas = base[orden], semanas[orden]
+
+    # Nivel si se llenan los k trimestres más bajos; el válido es el último
+    # que queda por encima de la carga del k-ésimo trimestre
+    niveles = (horas + np.cumsum(semanas_ordenadas * base_ordenada)) / np.cumsum(semanas_ordenadas)
+    nivel = niveles[np.flatnonzero(niveles >= base_ordenada)[-1]]
+
+    return semanas * np.maximum(nivel - base, 0)
+
+
+def balancear_horas(duracion_rap, asignacion, semanas) -> np.ndarray:
+    """
+    Reparte las horas de cada RAP entre sus trimestres asignados de modo
+    que la carga semanal de la ficha quede lo más pareja posible. Cada RAP
+    conserva su duración y solo usa sus trimestres; los RAPs de un solo
+    trimestre quedan fijos y los de varios se reacomodan por pasadas
+    (descenso por coordenadas sobre la suma de cuadrados de las cargas)
+
+    Returns:
+        (R, T) horas por trimestre (NaN para RAPs sin duración)
+    """
+    pesos = asignacion.astype(float)
+    suma_pesos = pesos.sum(axis=1, keepdims=True)
+    suma_pesos[suma_pesos == 0] = 1
+
+    # Punto de partida: reparto igual
+    horas = duracion_rap[:, None] * pesos / suma_pesos
+    conocidas = np.nan_to_num(horas)
+    carga = conocidas.sum(axis=0) / semanas
+
+    movibles = np.flatnonzero((asignacion.sum(axis=1) > 1) & ~np.isnan(duracion_rap))
+    for _ in range(PASADAS_BALANCEO):
+        cambio = 0.0
+        for r in movibles:
+            trimestres = np.flatnonzero(asignacion[r])
+            base = carga[trimestres] - conocidas[r, trimestres] / semanas[trimestres]
+            nuevas = llenar_nivel(base, semanas[trimestres], duracion_rap[r])
+
+            cambio = max(cambio, float(np.abs(nuevas - conocidas[r, trimestres]).max()))
+            conocidas[r, trimestres] = nuevas
+            carga[trimestres] = base + nuevas / semanas[trimestres]
+        if cambio < TOLERANCIA_BALANCEO:
+            break
+
+    conocidas[np.isnan(duracion_rap)] = np.nan
+    return conocidas
+
+
+def calcular_matriz_horas(duracion_competencia, competencia_de_rap, asignacion, semanas, modo: str = "igual") -> dict:
+    """
+    Calcula en un solo paso las horas de todos los RAPs de una ficha
+
+    Args:
+        duracion_competencia: (C,) duracion_maxima de cada competencia
+                              (NaN si es NULL: sus RAPs quedan sin horas)
+        competencia_de_rap: (R,) índice de competencia (0..C-1) de cada RAP
+        asignacion: (R, T) bool, RAP asignado al trimestre
+        semanas: (T,) semanas lectivas de cada trimestre
+        modo: "igual" reparte las horas del RAP por igual entre sus
+              trimestres (como recalcular_horas_rap); "semanas" las reparte
+              en proporción a las semanas de cada trimestre; "balanceado"
+              las reparte para emparejar la carga semanal de los trimestres
+
+    Returns:
+        dict con matrices numpy: duracion_rap (R,), horas_trimestre (R, T),
+        horas_semana (R, T), carga_trimestre (T,), carga_semana (T,)
+    """
+    duracion_competencia = np.asarray(duracion_competencia, dtype=float)
+    competencia_de_rap = np.asarray(competencia_de_rap, dtype=int)
+    asignacion = np.asarray(asignacion, dtype=bool)
+    semanas = np.asarray(semanas, dtype=float)
+
+    # Duración de cada RAP = duración de su competencia / RAPs de la competencia
+    raps_por_competencia = np.bincount(competencia_de_rap, minlength=len(duracion_competencia))
+    duracion_rap = duracion_competencia[competencia_de_rap] / raps_por_competencia[competencia_de_rap]
+
+    if modo == "balanceado":
+        horas_trimestre = balancear_horas(duracion_rap, asignacion, semanas)
+    else:
+        if modo == "semanas":
+            pesos = asignacion * semanas
+        elif modo == "igual":
+            pesos = asignacion.astype(float)
+        else:
+            raise ValueError(f"Modo de reparto desconocido: {modo}")
+
+        # Igual que el procedimiento: sin trimestres asignados se divide por 1
+        suma_pesos = pesos.sum(axis=1, keepdims=True)
+        suma_pesos[suma_pesos == 0] = 1
+        horas_trimestre = duracion_rap[:, None] * pesos / suma_pesos
+
+    horas_semana = horas_trimestre / semanas
+
+    # Las horas NULL (NaN) no suman a la carga de los trimestres
+    return {
+        "duracion_rap": duracion_rap,
+        "horas_trimestre": horas_trimestre,
+        "horas_semana": horas_semana,
+        "carga_trimestre": np.nansum(horas_trimestre, axis=0),
+        "carga_semana": np.nansum(horas_semana, axis=0),
+    }
+
+
+def validar_plan(matriz: dict, asignacion, duracion_competencia, competencia_de_rap,
+                 max_horas_semana: float = MAX_HORAS_SEMANA) -> dict:
+    """
+    Revisa las restricciones del plan
+
+    Returns:
+        dict: {"trimestres_sobrecargados": [t], "raps_sin_asignar": [r],
+               "competencias_incompletas": [c],
+               "competencias_sin_duracion": [c]} (índices)
+    """
+    asignacion = np.asarray(asignacion, dtype=bool)
+    duracion_competencia = np.asarray(duracion_competencia, dtype=float)
+
+    horas_por_competencia = np.bincount(
+        np.asarray(competencia_de_rap, dtype=int),
+        weights=np.nansum(matriz["horas_trimestre"], axis=1),
+        minlength=len(duracion_competencia),
+    )
+    sin_duracion = np.isnan(duracion_competencia)
+
+    return {
+        "trimestres_sobrecargados": np.flatnonzero(matriz["carga_semana"] > max_horas_semana).tolist(),
+        "raps_sin_asignar": np.flatnonzero(~asignacion.any(axis=1)).tolist(),
+        "competencias_incompletas": np.flatnonzero(
+            ~sin_duracion & ~np.isclose(horas_por_competencia, duracion_competencia)
+        ).tolist(),
+        "competencias_sin_duracion": np.flatnonzero(sin_duracion).tolist(),
+    }
+
+
+def planificar_sabana(filas: list, semanas=None, modo: str = "igual",
+                      max_horas_semana: float = MAX_HORAS_SEMANA) -> dict:
+    """
+    Recalcula la sábana completa de una ficha en una llamada
+
+    Args:
+        filas: filas de v_sabana_base de una ficha (id_competencia,
+               duracion_maxima, id_rap, id_trimestre, no_trimestre,
+               id_rap_trimestre); el RAP está asignado al trimestre si
+               id_rap_trimestre no es nulo
+        semanas: {no_trimestre: semanas}; por defecto SEMANAS_TRIMESTRE
+
+    Returns:
+        dict: {"asignaciones": [{id_rap_trimestre, id_rap, id_trimestre,
+               horas_trimestre, horas_semana}], "trimestres": [...],
+               "alertas": {...}}. Las horas son None (NULL) si la competencia
+               no tiene duracion_maxima, igual que en recalcular_horas_rap
+    """
+    ids_competencia = sorted({f["id_competencia"] for f in filas})
+    ids_rap = sorted({f["id_rap"] for f in filas})
+    trimestres = sorted({(f["no_trimestre"], f["id_trimestre"]) for f in filas})
+
+    indice_competencia = {id_c: i for i, id_c in enumerate(ids_competencia)}
+    indice_rap = {id_r: i for i, id_r in enumerate(ids_rap)}
+    indice_trimestre = {id_t: i for i, (_, id_t) in enumerate(trimestres)}
+
+    duracion_competencia = np.full(len(ids_competencia), np.nan)
+    competencia_de_rap = np.zeros(len(ids_rap), dtype=int)
+    asignacion = np.zeros((len(ids_rap), len(trimestres)), dtype=bool)
+    ids_rap_trimestre = {}
+
+    for f in filas:
+        r = indice_rap[f["id_rap"]]
+        c = indice_competencia[f["id_competencia"]]
+        if f["duracion_maxima"] is not None:
+            duracion_competencia[c] = f["duracion_maxima"]
+        competencia_de_rap[r] = c
+        if f.get("id_rap_trimestre") is not None:
+            t = indice_trimestre[f["id_trimestre"]]
+            asignacion[r, t] = True
+            ids_rap_trimestre[(r, t)] = f["id_rap_trimestre"]
+
+    semanas = semanas or {}
+    vector_semanas = np.array([semanas.get(no, SEMANAS_TRIMESTRE) for no, _ in trimestres], dtype=float)
+
+    matriz = calcular_matriz_horas(duracion_competencia, competencia_de_rap, asignacion, vector_semanas, modo)
+    alertas = validar_plan(matriz, asignacion, duracion_competencia, competencia_de_rap, max_horas_semana)
+
+    def horas(valor):
+        return None if np.isnan(valor) else float(valor)
+
+    filas_rap, columnas_trimestre = np.nonzero(asignacion)
+    asignaciones = [
+        {
+            "id_rap_trimestre": ids_rap_trimestre[(r, t)],
+            "id_rap": ids_rap[r],
+            "id_trimestre": trimestres[t][1],
+            "horas_trimestre": horas(matriz["horas_trimestre"][r, t]),
+            "horas_semana": horas(matriz["horas_semana"][r, t]),
+        }
+        for r, t in zip(filas_rap.tolist(), columnas_trimestre.tolist())
+    ]
+
+    return {
+        "asignaciones": asignaciones,
+        "trimestres": [
+            {
+                "no_trimestre": no,
+                "id_trimestre": id_t,
+                "horas": float(matriz["carga_trimestre"][t]),
+                "horas_semana": float(matriz["carga_semana"][t]),
+            }
+            for t, (no, id_t) in enumerate(trimestres)
+        ],
+        "alertas": {
+            "trimestres_sobrecargados": [trimestres[t][0] for t in alertas["trimestres_sobrecargados"]],
+            "raps_sin_asignar": [ids_rap[r] for r in alertas["raps_sin_asignar"]],
+            "competencias_incompletas": [ids_competencia[c] for c in alertas["competencias_incompletas"]],
+            "competencias_sin_duracion": [ids_competencia[c] for c in alertas["competencias_sin_duracion"]],
+        },
+    }
+
+
+# === EJECUCIÓN DESDE NODE (sabana.service.js) ===
+if __name__ == "__main__":
+    import json
+
+    # Entrada: JSON por stdin {"filas": [...], "semanas": {"1": 11}, "modo": "igual"}
+    entrada = json.load(sys.stdin)
+    semanas = {int(no): valor for no, valor in (entrada.get("semanas") or {}).items()}
+
+    resultado = planificar_sabana(entrada["filas"], semanas, entrada.get("modo", "igual"))
+    print(json.dumps({"success": True, "data": resultado}, ensure_ascii=False, indent=2))
@@ -0,0 +1,124 @@
+"""
+Pruebas de busqueda.indice_raps: ranking BM25, quitar RAPs, reindexar un
+programa y guardar/cargar el índice.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from busqueda.indice_raps import IndiceRaps, clave_rap
+
+# Competencia transversal con el mismo código y distinta redacción por programa
+INGLES_A = {
+    "codigo_competencia": "240202501",
+    "resultados_aprendizaje": [
+        "01 Identificar estructuras gramaticales en inglés",
+        "02 Comprender textos técnicos en inglés",
+        "03 Redactar correos en inglés",
+    ],
+}
+INGLES_B = {
+    "codigo_competencia": "240202501",
+    "resultados_aprendizaje": [
+        "01 Interpretar información básica en inglés",
+        "02 Comprender textos técnicos en inglés",
+    ],
+}
+SOFTWARE = {
+    "codigo_competencia": "220501096",
+    "resultados_aprendizaje": [
+        "01 Desarrollar la solución de software de acuerdo con el diseño",
+        "02 Realizar pruebas de software",
+    ],
+}
+
+
+class IndiceRapsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndiceRaps()
+        self.indice.agregar_competencias([INGLES_A, SOFTWARE], "228118")
+        self.indice.agregar_competencias([INGLES_B], "233104")
+
+    def assertPostingsSin(self, id_rap):
+        self.assertFalse(any(id_rap in ids for ids in self.indice.postings.values()))
+        self.assertFalse(any(id_rap in ids for ids in self.indice.postings_trigramas.values()))
+
+    def test_ranking_bm25(self):
+        desarrollar = clave_rap("228118", "220501096", "01")
+        pruebas = clave_rap("228118", "220501096", "02")
+
+        # Mismo término y frecuencia: gana la denominación más corta
+        resultados = self.indice.buscar("software")
+        self.assertEqual([id_rap for id_rap, _ in resultados], [pruebas, desarrollar])
+        self.assertGreater(resultados[0][1], resultados[1][1])
+
+        # Un término raro pesa más que uno presente en muchos RAPs
+        ids = [id_rap for id_rap, _ in self.indice.buscar("inglés correos")]
+        self.assertEqual(ids[0], clave_rap("228118", "240202501", "03"))
+        self.assertEqual(len(ids), 5)
+
+        self.assertEqual(self.indice.buscar("astronomía"), [])
+        self.assertEqual(len(self.indice.buscar("inglés", limite=2)), 2)
+
+    def test_competencia_transversal_por_programa(self):
+        # La redacción del primer programa sigue encontrándose tras indexar el segundo
+        self.assertEqual(self.indice.buscar_subcadena("identificar"), [clave_rap("228118", "240202501", "01")])
+        self.assertEqual(self.indice.buscar_subcadena("interpretar"), [clave_rap("233104", "240202501", "01")])
+        self.assertEqual(len(self.indice.buscar_subcadena("textos tecnicos")), 2)
+
+    def test_reindexar_quita_raps_desaparecidos(self):
+        obsoleto = clave_rap("228118", "240202501", "03")
+        self.assertIn(obsoleto, self.indice.documentos)
+
+        ingles_sin_03 = {**INGLES_A, "resultados_aprendizaje": INGLES_A["resultados_aprendizaje"][:2]}
+        self.indice.agregar_competencias([ingles_sin_03, SOFTWARE], "228118")
+
+        self.assertNotIn(obsoleto, self.indice.documentos)
+        self.assertPostingsSin(obsoleto)
+        self.assertEqual(self.indice.buscar("correos"), [])
+        self.assertEqual(len(self.indice.documentos), 6)
+
+    def test_eliminar_rap(self):
+        id_rap = clave_rap("228118", "220501096", "02")
+        longitud = self.indice.documentos[id_rap]["longitud"]
+        total = self.indice.longitud_total
+
+        self.indice.eliminar_rap(id_rap)
+
+        self.assertNotIn(id_rap, self.indice.documentos)
+        self.assertPostingsSin(id_rap)
+        self.assertAlmostEqual(self.indice.longitud_total, total - longitud)
+        self.assertEqual(self.indice.buscar_subcadena("pruebas de software"), [])
+
+    def test_guardar_y_cargar_json(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "indice.json")
+            self.indice.guardar(ruta)
+            with open(ruta, encoding="utf-8") as archivo:
+                self.assertEqual(json.load(archivo)["version"], 2)
+
+            cargado = IndiceRaps.cargar(ruta)
+            self.assertEqual(cargado.buscar("inglés"), self.indice.buscar("inglés"))
+            self.assertEqual(cargado.buscar_subcadena("comprender"), self.indice.buscar_subcadena("comprender"))
+
+            # El índice cargado se puede seguir actualizando por programa
+            cargado.agregar_competencias([], "233104")
+            self.assertEqual(cargado.buscar_subcadena("interpretar"), [])
+
+    def test_archivo_no_json_se_reconstruye(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "indice.pkl")
+            with open(ruta, "wb") as archivo:
+                archivo.write(b"\x80\x05\x95 pickle antiguo")
+            self.assertEqual(IndiceRaps.cargar(ruta).documentos, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Pruebas de planeacion.planificador_horas sobre una ficha pequeña:
+competencia 1 (300 h, 3 RAPs) y competencia 2 sin duracion_maxima.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from planeacion.planificador_horas import planificar_sabana
+
+TRIMESTRES = [(1, 10), (2, 11), (3, 12)]
+COMPETENCIA_DE_RAP = {1: 1, 2: 1, 3: 1, 4: 2}
+DURACION = {1: 300, 2: None}
+ASIGNADOS = {(1, 10), (1, 11), (2, 10), (3, 10), (3, 11), (3, 12), (4, 12)}
+
+
+def filas_ficha() -> list:
+    filas = []
+    for id_rap, id_competencia in COMPETENCIA_DE_RAP.items():
+        for no_trimestre, id_trimestre in TRIMESTRES:
+            asignado = (id_rap, id_trimestre) in ASIGNADOS
+            filas.append({
+                "id_competencia": id_competencia,
+                "duracion_maxima": DURACION[id_competencia],
+                "id_rap": id_rap,
+                "id_trimestre": id_trimestre,
+                "no_trimestre": no_trimestre,
+                "id_rap_trimestre": id_rap * 100 + id_trimestre if asignado else None,
+            })
+    return filas
+
+
+def horas_por_rap(resultado: dict) -> dict:
+    totales = {}
+    for a in resultado["asignaciones"]:
+        if a["horas_trimestre"] is not None:
+            totales[a["id_rap"]] = totales.get(a["id_rap"], 0.0) + a["horas_trimestre"]
+    return totales
+
+
+class PlanificarSabanaTest(unittest.TestCase):
+
+    def test_igual_como_el_procedimiento(self):
+        resultado = planificar_sabana(filas_ficha())
+        horas = {(a["id_rap"], a["id_trimestre"]): a["horas_trimestre"] for a in resultado["asignaciones"]}
+
+        self.assertAlmostEqual(horas[(1, 10)], 50.0)
+        self.assertAlmostEqual(horas[(2, 10)], 100.0)
+        self.assertAlmostEqual(horas[(3, 12)], 100.0 / 3)
+        self.assertEqual({a["id_rap_trimestre"] for a in resultado["asignaciones"]},
+                         {r * 100 + t for r, t in ASIGNADOS})
+
+    def test_duracion_nula_queda_nula(self):
+        resultado = planificar_sabana(filas_ficha())
+        rap_nulo = [a for a in resultado["asignaciones"] if a["id_rap"] == 4]
+
+        self.assertEqual([(a["horas_trimestre"], a["horas_semana"]) for a in rap_nulo], [(None, None)])
+        self.assertEqual(resultado["alertas"]["competencias_sin_duracion"], [2])
+        self.assertEqual(resultado["alertas"]["competencias_incompletas"], [])
+
+    def test_balanceado_empareja_trimestres(self):
+        igual = planificar_sabana(filas_ficha())
+        balanceado = planificar_sabana(filas_ficha(), modo="balanceado")
+
+        # Con reparto igual quedan 183 / 83 / 33 h; balanceado, 100 h cada uno
+        for trimestre in balanceado["trimestres"]:
+            self.assertAlmostEqual(trimestre["horas"], 100.0)
+
+        # Cada RAP conserva su duración y solo usa sus trimestres
+        for id_rap, total in horas_por_rap(igual).items():
+            self.assertAlmostEqual(horas_por_rap(balanceado)[id_rap], total)
+        self.assertEqual({(a["id_rap"], a["id_trimestre"]) for a in balanceado["asignaciones"]}, ASIGNADOS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Pruebas de regresión de main.procesar_pdf.
+Cada fixture de tests/fixtures/filas es el resultado de extraer_paginas sobre
+un programa de ejemplo; tests/fixtures/salidas guarda la respuesta esperada
+de procesar_pdf para cada tipo. Se reemplaza la lectura del PDF por las filas
+guardadas para que la prueba no dependa de pdfplumber ni de la cache en disco.
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+TIPOS = ["programa", "competencias", "raps", "proyecto", "fases", "actividades", "todo"]
+
+
+def cargar_json(ruta: Path):
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ProcesarPdfTest(unittest.TestCase):
+
+    def test_salidas_por_tipo(self):
+        fixtures = sorted((FIXTURES / "filas").glob("*.json"))
+        self.assertTrue(fixtures, "no hay fixtures de filas")
+
+        for ruta_filas in fixtures:
+            paginas = [(num, tablas) for num, tablas in cargar_json(ruta_filas)]
+            esperadas = cargar_json(FIXTURES / "salidas" / ruta_filas.name)
+
+            with mock.patch("extractors.bus_filas.obtener_paginas", return_value=paginas):
+                for tipo in TIPOS:
+                    with self.subTest(fixture=ruta_filas.stem, tipo=tipo):
+                        respuesta = main.procesar_pdf(str(ruta_filas), tipo)
+                        # Ida y vuelta por JSON: las tuplas salen como listas
+                        obtenida = json.loads(json.dumps(respuesta, ensure_ascii=False))
+                        self.assertEqual(obtenida, esperadas[tipo])
+
+
+if __name__ == "__main__":
+    unittest.main()
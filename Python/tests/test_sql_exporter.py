@@ -0,0 +1,80 @@
+"""
+Pruebas de exporters.sql_exporter: dos programas cargados en la misma base
+SQLite no deben chocar en ids ni dejar llaves foráneas rotas.
+"""
+
+import json
+import sqlite3
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from exporters.sql_exporter import (
+    TABLAS, GeneradorIds, cargar_sqlite, crear_esquema_sqlite, ejecutar_plan_sqlite, filas_carga,
+)
+
+SALIDAS = Path(__file__).resolve().parent / "fixtures" / "salidas"
+
+
+def datos_programa(nombre: str) -> dict:
+    with open(SALIDAS / f"{nombre}.json", encoding="utf-8") as f:
+        return json.load(f)["todo"]["data"]
+
+
+class CargaSqliteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.conexion = sqlite3.connect(":memory:")
+        crear_esquema_sqlite(self.conexion)
+
+    def tearDown(self):
+        self.conexion.close()
+
+    def test_dos_programas(self):
+        programas = [datos_programa("programa_a"), datos_programa("programa_b")]
+        vacia = {tabla: 0 for tabla in TABLAS}
+        esperadas = {tabla: 0 for tabla in TABLAS}
+        for datos in programas:
+            for tabla, filas in filas_carga(datos, vacia).items():
+                esperadas[tabla] += len(filas)
+
+        primera = cargar_sqlite(programas[0], self.conexion)
+        segunda = cargar_sqlite(programas[1], self.conexion)
+        self.assertEqual(primera["ids_base"], vacia)
+        self.assertEqual(segunda["ids_base"]["programa_formacion"], 1)
+        self.assertEqual(segunda["ids_base"]["raps"], esperadas["raps"] - len(filas_carga(programas[1], vacia)["raps"]))
+
+        estado = ejecutar_plan_sqlite([], self.conexion)
+        self.assertEqual(estado["filas"], esperadas)
+        self.assertEqual(estado["violaciones_fk"], [])
+        self.assertGreater(esperadas["raps"], 0)
+
+        # Cada RAP cuelga de una competencia de su propio programa
+        raps_por_programa = self.conexion.execute("""
+            SELECT c.id_programa, COUNT(*) FROM raps r
+            JOIN competencias c ON c.id_competencia = r.id_competencia
+            GROUP BY c.id_programa ORDER BY c.id_programa
+        """).fetchall()
+        self.assertEqual(raps_por_programa, [
+            (indice, len(filas_carga(datos, vacia)["raps"]))
+            for indice, datos in enumerate(programas, start=1)
+        ])
+
+    def test_error_revierte_la_carga(self):
+        datos = datos_programa("programa_a")
+        datos["programa"][0]["nombre_programa"] = ""   # viola NOT NULL
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            cargar_sqlite(datos, self.conexion)
+        self.assertFalse(self.conexion.in_transaction)
+        self.assertEqual(ejecutar_plan_sqlite([], self.conexion)["filas"], {tabla: 0 for tabla in TABLAS})
+
+    def test_ids_base_obligatorio(self):
+        with self.assertRaises(ValueError):
+            GeneradorIds({"programa_formacion": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
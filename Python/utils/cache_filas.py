@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+def log_debug(mensaje):
+    """Enviar logs a stderr para no contaminar stdout"""
+    print(mensaje, file=sys.stderr, flush=True)
+
+# Directorio de los sidecars y tiempo de vida (segundos), configurables por entorno
+DIR_CACHE = os.environ.get("ALISTAMIENTO_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "alistamiento_filas")
+TTL_SEGUNDOS = int(os.environ.get("ALISTAMIENTO_CACHE_TTL", 24 * 60 * 60))
+
+# Se incrementa si cambia el formato de lo que se guarda. Los sidecars son
+# JSON (y no pickle): el directorio por defecto está en el temp compartido
+VERSION_FORMATO = 2
+EXTENSION = ".filas.json"
+
+# Caché de geometría: huella de las líneas de la página -> celdas de sus
+# tablas. Las plantillas del SENA repiten la misma cuadrícula en muchas
+# páginas; en esas se omite la detección de intersecciones y celdas.
+MAX_GEOMETRIAS = 256
+DECIMALES_HUELLA = 3
+
+_geometrias = OrderedDict()
+estadisticas_geometria = {"aciertos": 0, "fallos": 0}
+
+
+def hash_archivo(pdf_path: str) -> str:
+    """SHA-256 del contenido del PDF (clave del sidecar)"""
+    sha = hashlib.sha256()
+    with open(pdf_path, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def ruta_sidecar(clave: str) -> str:
+    return os.path.join(DIR_CACHE, clave + EXTENSION)
+
+
+def precargar_pdf():
+    """
+    Importa pdfplumber (y con él pdfminer) por adelantado. extraer_paginas
+    lo importa de forma diferida; el zygote y los workers del planificador
+    llaman a esto para no pagar esa importación en cada trabajo
+    """
+    import pdfplumber
+    import pdfplumber.table
+
+
+def huella_geometria(page) -> str:
+    """Huella de las líneas de la página (bordes redondeados y ordenados)"""
+    bordes = sorted(
+        (borde["orientation"],) + tuple(round(borde[eje], DECIMALES_HUELLA) for eje in ("x0", "top", "x1", "bottom"))
+        for borde in page.edges
+    )
+    sha = hashlib.sha1(repr((tuple(page.bbox), bordes)).encode())
+    return sha.hexdigest()
+
+
+def extraer_tablas_pagina(page) -> list:
+    """
+    Equivalente a page.extract_tables() que reutiliza las celdas ya
+    detectadas para una página con la misma cuadrícula; solo extrae el
+    texto dentro de ellas. Una geometría nueva usa la detección completa
+    """
+    from pdfplumber.table import Table, TableSettings
+
+    ajustes = TableSettings.resolve(None)
+    huella = huella_geometria(page)
+    celdas_tablas = _geometrias.get(huella)
+
+    if celdas_tablas is None:
+        estadisticas_geometria["fallos"] += 1
+        tablas = page.find_tables(ajustes)
+        _geometrias[huella] = [tabla.cells for tabla in tablas]
+        if len(_geometrias) > MAX_GEOMETRIAS:
+            _geometrias.popitem(last=False)
+    else:
+        estadisticas_geometria["aciertos"] += 1
+        _geometrias.move_to_end(huella)
+        tablas = [Table(page, celdas) for celdas in celdas_tablas]
+
+    return [tabla.extract(**(ajustes.text_settings or {})) for tabla in tablas]
+
+
+def extraer_paginas(pdf_path: str, inicio: int = 0, fin=None) -> list:
+    """
+    Extrae las tablas de las páginas [inicio, fin) con pdfplumber
+
+    Returns:
+        list: [(numero_pagina, tablas)], tablas = [[fila, ...], ...]
+    """
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return [
+            (page.page_number, extraer_tablas_pagina(page))
+            for page in pdf.pages[inicio:fin]
+        ]
+
+
+def directorio_seguro(crear: bool = False) -> bool:
+    """
+    True si DIR_CACHE es un directorio real, del usuario actual y sin
+    escritura para otros (con crear=True lo crea con permisos 0o700).
+    Si otro usuario creó el directorio antes, el caché no se usa
+    """
+    try:
+        if crear:
+            os.makedirs(DIR_CACHE, mode=0o700, exist_ok=True)
+        info = os.lstat(DIR_CACHE)
+    except OSError:
+        return False
+
+    if not stat.S_ISDIR(info.st_mode) or info.st_mode & 0o022:
+        return False
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    return True
+
+
+def sidecar_vigente(clave: str) -> bool:
+    """True si existe un sidecar para la clave y no ha caducado (sin cargarlo)"""
+    if not directorio_seguro():
+        return False
+    try:
+        return time.time() - os.path.getmtime(ruta_sidecar(clave)) <= TTL_SEGUNDOS
+    except OSError:
+        return False
+
+
+def leer_sidecar(clave: str):
+    """Carga las páginas guardadas o None si no existe, caducó o es inválido"""
+    ruta = ruta_sidecar(clave)
+    try:
+        if not sidecar_vigente(clave):
+            return None
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        if datos.get("version") != VERSION_FORMATO:
+            return None
+        return [(int(numero), tablas) for numero, tablas in datos["paginas"]]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def guardar_sidecar(clave: str, paginas: list):
+    """Guarda las páginas de forma atómica (archivo temporal + replace)"""
+    if not directorio_seguro(crear=True):
+        log_debug(f"Caché de filas desactivado: {DIR_CACHE} no es un directorio privado del usuario")
+        return
+
+    descriptor, temporal = tempfile.mkstemp(dir=DIR_CACHE, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as archivo:
+            json.dump({"version": VERSION_FORMATO, "paginas": paginas}, archivo, ensure_ascii=False)
+        os.replace(temporal, ruta_sidecar(clave))
+    except OSError as e:
+        log_debug(f"No se pudo guardar el caché de filas: {str(e)}")
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def limpiar_cache(ttl: int = TTL_SEGUNDOS) -> int:
+    """Elimina los sidecars más viejos que el TTL. Retorna cuántos se borraron"""
+    if not directorio_seguro():
+        return 0
+
+    limite = time.time() - ttl
+    borrados = 0
+    for nombre in os.listdir(DIR_CACHE):
+        if not nombre.endswith((EXTENSION, ".tmp")):
+            continue
+        ruta = os.path.join(DIR_CACHE, nombre)
+        try:
+            if os.path.getmtime(ruta) < limite:
+                os.remove(ruta)
+                borrados += 1
+        except OSError:
+            continue
+    return borrados
+
+
+def obtener_paginas(pdf_path: str) -> list:
+    """
+    Páginas con sus tablas ya extraídas. La primera llamada para un
+    documento usa pdfplumber y guarda el sidecar; las siguientes (otro
+    tipo, reintentos) lo leen sin abrir el PDF.
+
+    Returns:
+        list: [(numero_pagina, tablas)]
+    """
+    clave = hash_archivo(pdf_path)
+
+    paginas = leer_sidecar(clave)
+    if paginas is not None:
+        log_debug(f"Filas cargadas desde caché ({len(paginas)} páginas)")
+        return paginas
+
+    paginas = extraer_paginas(pdf_path)
+    guardar_sidecar(clave, paginas)
+    limpiar_cache()
+    return paginas
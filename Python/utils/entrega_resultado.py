@@ -0,0 +1,53 @@
+import json
+import mmap
+import os
+import sys
+import tempfile
+
+def log_debug(mensaje):
+    """Enviar logs a stderr para no contaminar stdout"""
+    print(mensaje, file=sys.stderr, flush=True)
+
+# Entrega del resultado por archivo mapeado en memoria: el JSON compacto se
+# escribe en un archivo temporal y por stdout solo viaja {"handle", "longitud"}.
+# Se usa un archivo (y no multiprocessing.shared_memory) porque en Windows el
+# segmento compartido desaparece cuando el proceso Python termina.
+DIR_RESULTADOS = os.environ.get("ALISTAMIENTO_RESULTADOS_DIR") or tempfile.gettempdir()
+PREFIJO = "alistamiento_resultado_"
+
+
+def escribir_resultado(resultado: dict) -> dict:
+    """
+    Escribe el resultado como JSON compacto (UTF-8) en un archivo mapeado
+
+    Returns:
+        dict: {"handle": ruta del archivo, "longitud": bytes escritos}
+    """
+    datos = json.dumps(resultado, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    descriptor, ruta = tempfile.mkstemp(dir=DIR_RESULTADOS, prefix=PREFIJO, suffix=".json")
+    try:
+        os.ftruncate(descriptor, len(datos))
+        with mmap.mmap(descriptor, len(datos)) as mapa:
+            mapa[:] = datos
+    except OSError:
+        os.close(descriptor)
+        os.remove(ruta)
+        raise
+    os.close(descriptor)
+
+    return {"handle": ruta, "longitud": len(datos)}
+
+
+def leer_resultado(handle: str, longitud: int, borrar: bool = True) -> dict:
+    """Lee un resultado entregado por escribir_resultado (consumidores en Python)"""
+    try:
+        with open(handle, "rb") as archivo:
+            with mmap.mmap(archivo.fileno(), longitud, access=mmap.ACCESS_READ) as mapa:
+                return json.loads(mapa[:longitud])
+    finally:
+        if borrar:
+            try:
+                os.remove(handle)
+            except OSError as e:
+                log_debug(f"No se pudo borrar el resultado {handle}: {str(e)}")
@@ -0,0 +1,103 @@
+import re
+
+# Gramática compartida de los extractores: todas las palabras clave y
+# expresiones regulares se definen (y compilan) una sola vez al importar.
+
+# === TEXTO GENERAL ===
+ESPACIOS_RE = re.compile(r"\s+")
+HORAS_TEXTO_RE = re.compile(r"(\d+)\s*horas?", re.IGNORECASE)
+NUMERO_RE = re.compile(r"(\d+)")
+VINETA_ITEM_RE = re.compile(r"^[*•\-\d.\s]+")
+CARACTERES_REPETIDOS_RE = re.compile(r"(.)\1+")
+
+# === RUIDO (headers, footers, etc.) ===
+RUIDO_RE = re.compile("|".join([
+    r"LINEA TECNOLOGICA",
+    r"RED TECNOLOGICA",
+    r"RED DE CONOCIMIENTO",
+    r"GESTION DE LA INFORMACION",
+    r"TECNOLOGIAS DE LA INFORMACION",
+    r"DISENO Y DESARROLLO",
+    r"^\d+/\d+/\d+\s+\d+:\d+",  # fechas
+    r"^PAGINA\s+\d+",
+    r"INFORMACION Y LAS COMUNICACIONES",
+    r"^SOFTWARE$",
+    r"^DENOMINACION$",
+]))
+PALABRA_CORTA_RE = re.compile(r"[a-zA-Z]{5,}")
+PALABRA_VALIDA_RE = re.compile(r"[a-zA-ZÁÉÍÓÚáéíóúÑñ]{4,}")
+
+# === PROGRAMA ===
+PROGRAMA_NOMBRE = "DENOMINACION DEL PROGRAMA"
+PROGRAMA_CODIGO = "CODIGO PROGRAMA"
+PROGRAMA_VERSION = "VERSION PROGRAMA"
+PROGRAMA_VIGENCIA = "VIGENCIA DEL PROGRAMA"
+PROGRAMA_DURACION = "DURACION MAXIMA ESTIMADA DEL APRENDIZAJE (HORAS)"
+PROGRAMA_LECTIVA = "ETAPA LECTIVA"
+PROGRAMA_PRODUCTIVA = "ETAPA PRODUCTIVA"
+PROGRAMA_TIPO = "TIPO DE PROGRAMA"
+PROGRAMA_TITULO = "TITULO O CERTIFICADO QUE OBTENDRA"
+
+# === COMPETENCIAS Y RAPs ===
+COMPETENCIA_UNIDAD = "UNIDAD DE COMPETENCIA"
+COMPETENCIA_CODIGO = "CODIGO NORMA DE COMPETENCIA LABORAL"
+COMPETENCIA_NOMBRE = "NOMBRE DE LA COMPETENCIA"
+COMPETENCIA_HORA = "DURACION MAXIMA ESTIMADA"
+COMPETENCIA_RESULTADOS = "RESULTADOS DE APRENDIZAJE"
+COMPETENCIA_CONOCIMIENTOS_PROCESO = "CONOCIMIENTOS DE PROCESO"
+COMPETENCIA_CRITERIOS_EVALUACION = "CRITERIOS DE EVALUACION"
+COMPETENCIA_CONOCIMIENTOS_SABER = "CONOCIMIENTOS DEL SABER"
+ETAPA_PRACTICA = "ETAPA PRACTICA"
+CODIGO_ETAPA_PRACTICA = "999999999"
+
+HORA_RE = re.compile(r"\b(\d{1,4})\s*(HORA|HORAS)\b", re.IGNORECASE)
+
+IGNORE_KEYS = (
+    "LINEA TECNOLOGICA",
+    "RED TECNOLOGICA",
+    "RED DE CONOCIMIENTO",
+    "DENOMINACION",
+)
+
+# Fin de la sección de RAPs de una competencia
+FIN_SECCION_RE = re.compile("|".join([
+    r"PERFIL DEL INSTRUCTOR",
+    r"REQUISITOS ACADEMICOS",
+    r"4\.8\s+PERFIL",
+    r"4\.8\.1",
+    r"CONTENIDOS CURRICULARES DE LA COMPETENCIA",
+]))
+
+# Línea de "4.6 CONOCIMIENTOS" que se cuela en los resultados
+RAP_CONOCIMIENTOS_RE = re.compile(r"^\s*4\.6\s*CONOCIMIENTOS")
+
+# === PROYECTO ===
+PROYECTO_SECCION = "INFORMACION BASICA DEL PROYECTO"
+PROYECTO_CODIGO_PROYECTO = "CODIGO PROYECTO SOFIA"
+PROYECTO_CODIGO_PROGRAMA = "CODIGO DEL PROGRAMA SOFIA"
+PROYECTO_CENTRO = "CENTRO DE FORMACION"
+PROYECTO_REGIONAL = "REGIONAL"
+PROYECTO_NOMBRE = "NOMBRE DEL PROYECTO"
+PROYECTO_PROGRAMA_FORMACION = "PROGRAMA DE FORMACION AL QUE DA RESPUESTA"
+PROYECTO_PLANEACION = "PLANEACION DEL PROYECTO"
+PROYECTO_FASES = "FASES DEL PROYECTO"
+PROYECTO_ACTIVIDADES = "ACTIVIDADES DEL PROYECTO"
+
+CODIGO_LARGO_RE = re.compile(r"^\d{5,}$")
+
+# Fases válidas, en el orden lógico del proyecto
+FASES_VALIDAS = ("ANALISIS", "PLANEACION", "EJECUCION", "EVALUACION")
+
+FIN_PLANEACION_ACTIVIDADES = ("RUBROS PRESUPUESTALES", "EQUIPO QUE PARTICIPO")
+FIN_PLANEACION_FASES = FIN_PLANEACION_ACTIVIDADES + ("VALORACION PRODUCTIVA",)
+
+# Formato: 593343 - 01 IDENTIFICAR LA DINÁMICA...
+RAP_ACTIVIDAD_RE = re.compile(r"\d{6,7}\s*-\s*(\d{1,2})\s+([A-ZÀÁÉÍÓÚÑ].+?)(?=\d{6,7}\s*-|\Z)", re.DOTALL)
+
+# === RAP PARSER (port de rap_parser.js) ===
+TITULO_SECCION_RE = re.compile(r"\n[A-ZÑÁÉÍÓÚ][A-ZÑÁÉÍÓÚ\s]{20,}:")
+DIVISION_SECCION_RE = re.compile(r"\n(?=[A-ZÑÁÉÍÓÚ][A-ZÑÁÉÍÓÚ\s]{15,}:)")
+CODIGO_RAP_RE = re.compile(r"^(\d{1,2})\s+(.+)")
+PREFIJO_NUMERO_RE = re.compile(r"^\d+\s+")
+VINETA_RE = re.compile(r"^\*\s*")
+DOS_PUNTOS_FINAL_RE = re.compile(r":$")
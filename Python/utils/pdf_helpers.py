@@ -1,15 +1,20 @@
-import re
 import unicodedata
+from utils.patrones import (
+    ESPACIOS_RE, HORAS_TEXTO_RE, NUMERO_RE, VINETA_ITEM_RE,
+    RUIDO_RE, PALABRA_CORTA_RE, PALABRA_VALIDA_RE
+)
 
 # === Funciones auxiliares ===
 def strip_accents(s: str) -> str:
     """Quita tildes"""
+    if s.isascii():
+        return s
     return ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
 
 def norm(s: str) -> str:
     """Normaliza texto: mayúsculas y espacios"""
     s = strip_accents(s or "").upper()
-    s = re.sub(r"\s+", " ", s)
+    s = ESPACIOS_RE.sub(" ", s)
     return s.strip()
 
 def extraer_horas(texto: str) -> str:
@@ -17,41 +22,31 @@ def extraer_horas(texto: str) -> str:
     if not texto:
         return ""
     # Buscar patrón de número seguido de "horas"
-    match = re.search(r'(\d+)\s*horas?', texto, re.IGNORECASE)
+    match = HORAS_TEXTO_RE.search(texto)
     if match:
         return f"{match.group(1)} horas"
     return ""
 
+def extraer_numero_horas(texto):
+    """Extrae el número de horas como entero (ej: '3120 horas' -> 3120)"""
+    if not texto:
+        return None
+    match = NUMERO_RE.search(str(texto))
+    return int(match.group(1)) if match else None
+
 def limpiar_item(texto):
     """Limpia viñetas o caracteres extra de un ítem"""
-    texto = re.sub(r"^[*•\-\d.\s]+", "", texto.strip())
+    texto = VINETA_ITEM_RE.sub("", texto.strip())
     return texto.strip()
 
 def es_ruido(texto):
     """Detecta si el texto es ruido (header, footer, etc.)"""
-    texto_norm = norm(texto)
-    
-    # Lista de patrones de ruido
-    ruido_patterns = [
-        r"LINEA TECNOLOGICA",
-        r"RED TECNOLOGICA",
-        r"RED DE CONOCIMIENTO",
-        r"GESTION DE LA INFORMACION",
-        r"TECNOLOGIAS DE LA INFORMACION",
-        r"DISENO Y DESARROLLO",
-        r"^\d+/\d+/\d+\s+\d+:\d+",  # fechas
-        r"^PAGINA\s+\d+",
-        r"INFORMACION Y LAS COMUNICACIONES",
-        r"^SOFTWARE$",
-        r"^DENOMINACION$"
-    ]
-    
-    for pattern in ruido_patterns:
-        if re.search(pattern, texto_norm):
-            return True
+    # Patrones de ruido (utils.patrones.RUIDO_RE)
+    if RUIDO_RE.search(norm(texto)):
+        return True
     
     # Si el texto es muy corto (menos de 10 caracteres) y no tiene contenido sustancial
-    if len(texto.strip()) < 10 and not re.search(r"[a-zA-Z]{5,}", texto):
+    if len(texto.strip()) < 10 and not PALABRA_CORTA_RE.search(texto):
         return True
         
     return False
@@ -65,7 +60,7 @@ def es_contenido_valido(texto):
         return False
     
     # Debe tener al menos una palabra completa
-    if not re.search(r"[a-zA-ZÁÉÍÓÚáéíóúÑñ]{4,}", texto):
+    if not PALABRA_VALIDA_RE.search(texto):
         return False
         
     return True
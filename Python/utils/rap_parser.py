@@ -0,0 +1,130 @@
+import math
+from utils.pdf_helpers import norm
+from utils.patrones import (
+    TITULO_SECCION_RE, DIVISION_SECCION_RE, CODIGO_RAP_RE,
+    PREFIJO_NUMERO_RE, VINETA_RE, DOS_PUNTOS_FINAL_RE
+)
+
+# Port de src/middleware/rap_parser.js: misma lógica para que las
+# exportaciones del lado Python produzcan los mismos RAPs que guarda Node.
+
+
+def extraer_bloque(texto: str) -> str:
+    """Extrae los items de una sección (líneas que empiezan con *)"""
+    if not texto:
+        return ""
+
+    items = [
+        VINETA_RE.sub("", linea.strip()).strip()
+        for linea in texto.split("\n")
+        if linea.strip().startswith("*")
+    ]
+    return "\n".join(items)
+
+
+def tiene_titulos_secciones(texto_completo: str) -> bool:
+    """Detecta si el texto tiene estructura con títulos de sección"""
+    if not texto_completo:
+        return False
+    return bool(TITULO_SECCION_RE.search(texto_completo))
+
+
+def parsear_con_titulos(texto_completo: str, lista_raps: list) -> dict:
+    """Parsea conocimientos CON títulos de sección (ej: Construcción Software)"""
+    resultado = {}
+
+    raps_normalizados = [
+        (rap, norm(PREFIJO_NUMERO_RE.sub("", rap, count=1)[:40]))
+        for rap in lista_raps
+    ]
+
+    for seccion in DIVISION_SECCION_RE.split(texto_completo):
+        if not seccion.strip():
+            continue
+
+        titulo = DOS_PUNTOS_FINAL_RE.sub("", seccion.split("\n")[0].strip())
+        titulo_norm = norm(titulo)
+
+        for original, clave in raps_normalizados:
+            if clave in titulo_norm or titulo_norm in clave:
+                bloque = extraer_bloque(seccion)
+                if bloque:
+                    resultado[original] = bloque
+                break
+
+    return resultado
+
+
+def parsear_sin_titulos(texto_completo: str, lista_raps: list) -> dict:
+    """
+    Parsea conocimientos SIN títulos (ej: Inglés)
+    Distribuye los items equitativamente entre los RAPs
+    """
+    resultado = {}
+
+    texto = extraer_bloque(texto_completo)
+    if not texto:
+        return resultado
+
+    lineas = texto.split("\n")
+    total = len(lineas)
+    por_rap = math.ceil(total / len(lista_raps))
+
+    for i, rap in enumerate(lista_raps):
+        ini = i * por_rap
+        fin = min(ini + por_rap, total)
+        resultado[rap] = "\n".join(lineas[ini:fin])
+
+    return resultado
+
+
+def parsear_por_rap(texto_completo: str, lista_raps: list) -> dict:
+    """Divide el texto de conocimientos/criterios en bloques por RAP"""
+    if not texto_completo or not lista_raps:
+        return {}
+
+    if tiene_titulos_secciones(texto_completo):
+        return parsear_con_titulos(texto_completo, lista_raps)
+    return parsear_sin_titulos(texto_completo, lista_raps)
+
+
+def calcular_duracion_por_rap(duracion_maxima, num_raps: int):
+    """Duración por RAP igual que PdfController: Math.round(duracion / numRaps)"""
+    if not duracion_maxima or not num_raps:
+        return None
+    return math.floor(duracion_maxima / num_raps + 0.5)
+
+
+def procesar_competencia(competencia: dict) -> list:
+    """
+    Procesa una competencia de extraer_raps y retorna RAPs estructurados
+
+    Returns:
+        list: [{"codigo", "denominacion", "conocimientos_proceso",
+                "conocimientos_saber", "criterios_evaluacion"}, ...]
+    """
+    raps = competencia.get("resultados_aprendizaje") or []
+    if not raps:
+        return []
+
+    proceso_por_rap = parsear_por_rap(competencia.get("conocimientos_proceso"), raps)
+    saber_por_rap = parsear_por_rap(competencia.get("conocimientos_saber"), raps)
+    criterios_por_rap = parsear_por_rap(competencia.get("criterios_evaluacion"), raps)
+
+    estructurados = []
+    for index, rap in enumerate(raps):
+        rap_limpio = rap.replace("\n", " ").strip()
+
+        match = CODIGO_RAP_RE.match(rap_limpio)
+        codigo = match.group(1).zfill(2) if match else str(index + 1).zfill(2)
+        denominacion = match.group(2).strip() if match else rap_limpio
+
+        estructurados.append({
+            "codigo": codigo,
+            "denominacion": denominacion,
+            "conocimientos_proceso": proceso_por_rap.get(rap, ""),
+            "conocimientos_saber": saber_por_rap.get(rap, ""),
+            "criterios_evaluacion": criterios_por_rap.get(rap, ""),
+        })
+
+    return estructurados
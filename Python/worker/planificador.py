@@ -0,0 +1,421 @@
+import sys
+import os
+import json
+import itertools
+import math
+import multiprocessing
+import queue
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+# Permite ejecutar como "python worker/planificador.py" desde cualquier cwd
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import configurar_utf8, precargar
+from utils.cache_filas import extraer_paginas, guardar_sidecar, hash_archivo, sidecar_vigente
+from worker.zygote import ejecutar
+
+def log_debug(mensaje):
+    """Enviar logs a stderr para no contaminar stdout"""
+    print(mensaje, file=sys.stderr, flush=True)
+
+# === MODELO DE COSTO ===
+# Segundos estimados de extracción (se ajustan con las estadísticas por clase)
+SEGUNDOS_POR_PAGINA = 0.03
+SEGUNDOS_POR_MB = 0.05
+SEGUNDOS_DESDE_CACHE = 0.05
+BYTES_POR_PAGINA = 30 * 1024   # solo si no se puede contar las páginas
+
+# Clase de tamaño -> máximo de páginas (None = sin límite)
+CLASES_TAMANO = [("pequeño", 30), ("mediano", 120), ("grande", None)]
+
+# === POLÍTICA ===
+# Prioridad = costo estimado - ENVEJECIMIENTO * segundos en espera: el
+# trabajo más corto va primero, pero uno largo no espera indefinidamente
+ENVEJECIMIENTO = 0.5
+
+# Documentos con más páginas que el umbral se reparten en trozos entre workers
+UMBRAL_TROZOS = 80
+PAGINAS_POR_TROZO = 40
+
+# Espera máxima (s) por un resultado antes de revisar si llegaron trabajos
+INTERVALO_SONDEO = 0.05
+
+# Latencias recientes que se guardan por clase para los percentiles
+# (atender corre indefinidamente)
+MUESTRAS_LATENCIA = 1000
+
+
+def contar_paginas(pdf_path: str):
+    """Número de páginas sin parsear el contenido (pypdfium2), o None"""
+    try:
+        import pypdfium2 as pdfium
+
+        documento = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(documento)
+        finally:
+            documento.close()
+    except Exception:
+        return None
+
+
+def clase_tamano(paginas: int) -> str:
+    for clase, maximo in CLASES_TAMANO:
+        if maximo is None or paginas <= maximo:
+            return clase
+    return CLASES_TAMANO[-1][0]
+
+
+def estimar_costo(pdf_path: str) -> dict:
+    """
+    Estima el costo de extraer un documento antes de parsearlo
+
+    Returns:
+        dict: {"paginas", "bytes", "clase", "costo" (segundos), "clave",
+               "en_cache"}
+    """
+    try:
+        tamano = os.path.getsize(pdf_path)
+        clave = hash_archivo(pdf_path)
+    except OSError:
+        # procesar_pdf reportará el error; aquí solo se evita bloquear la cola
+        tamano, clave = 0, None
+
+    paginas = contar_paginas(pdf_path)
+    if paginas is None:
+        paginas = max(1, round(tamano / BYTES_POR_PAGINA))
+
+    en_cache = bool(clave) and sidecar_vigente(clave)
+    if en_cache:
+        costo = SEGUNDOS_DESDE_CACHE
+    else:
+        costo = paginas * SEGUNDOS_POR_PAGINA + tamano / 2**20 * SEGUNDOS_POR_MB
+
+    return {
+        "paginas": paginas,
+        "bytes": tamano,
+        "clase": clase_tamano(paginas),
+        "costo": costo,
+        "clave": clave,
+        "en_cache": en_cache,
+    }
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil por rango más cercano"""
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+class Planificador:
+    """
+    Cola de extracción con prioridad por trabajo más corto (con
+    envejecimiento) sobre un pool de procesos. Los documentos grandes se
+    reparten por rangos de páginas; al terminar los trozos se guarda el
+    sidecar de filas y un último paso corre los extractores sobre las
+    páginas unidas.
+    """
+
+    def __init__(self, workers=None, envejecimiento: float = ENVEJECIMIENTO,
+                 umbral_trozos: int = UMBRAL_TROZOS, paginas_por_trozo: int = PAGINAS_POR_TROZO):
+        self.workers = workers or os.cpu_count() or 1
+        self.envejecimiento = envejecimiento
+        self.umbral_trozos = umbral_trozos
+        self.paginas_por_trozo = paginas_por_trozo
+
+        self.pool = self._crear_pool()
+        self.pendientes = []
+        self.en_curso = {}                   # futuro -> tarea
+        self.latencias = defaultdict(lambda: deque(maxlen=MUESTRAS_LATENCIA))   # clase -> [ms]
+        self.trabajos_por_clase = Counter()
+        self._secuencia = itertools.count()
+
+    def _crear_pool(self) -> ProcessPoolExecutor:
+        # "spawn" (como en Windows): un fork con el hilo lector de atender()
+        # bloqueado en stdin deja al hijo esperando ese lock al cerrar stdin
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=precargar,
+        )
+
+    # === ENTRADA ===
+    def enviar(self, trabajo: dict) -> dict:
+        """
+        Encola un trabajo {"id", "pdf_path", "tipo", "mmap"}. Retorna el
+        trabajo con su estimación de costo
+        """
+        trabajo = {**trabajo, **estimar_costo(trabajo["pdf_path"]), "llegada": time.perf_counter()}
+        paginas = trabajo["paginas"]
+
+        if not trabajo["en_cache"] and trabajo["clave"] and paginas > self.umbral_trozos:
+            rangos = [
+                (inicio, min(inicio + self.paginas_por_trozo, paginas))
+                for inicio in range(0, paginas, self.paginas_por_trozo)
+            ]
+            trabajo["trozos"] = [None] * len(rangos)
+            trabajo["faltan"] = len(rangos)
+            trabajo["costo_restante"] = 0.0
+            for indice, (inicio, fin) in enumerate(rangos):
+                costo = (fin - inicio) * SEGUNDOS_POR_PAGINA
+                trabajo["costo_restante"] += costo
+                self._encolar(trabajo, "trozo", costo, indice=indice, inicio=inicio, fin=fin)
+            log_debug(f"{os.path.basename(trabajo['pdf_path'])}: {paginas} páginas en {len(rangos)} trozos")
+        else:
+            self._encolar(trabajo, "documento", trabajo["costo"])
+
+        return trabajo
+
+    def _encolar(self, trabajo: dict, tipo_tarea: str, costo: float, **extra):
+        self.pendientes.append({
+            "trabajo": trabajo,
+            "tipo_tarea": tipo_tarea,
+            "costo": costo,
+            "secuencia": next(self._secuencia),
+            **extra,
+        })
+
+    def ocupado(self) -> bool:
+        return bool(self.pendientes or self.en_curso)
+
+    # === DESPACHO ===
+    def prioridad(self, tarea: dict, ahora: float) -> tuple:
+        trabajo = tarea["trabajo"]
+        espera = ahora - trabajo["llegada"]
+        # Un trozo vale lo que le falta a su documento (trozos sin terminar),
+        # no su propio costo: así el trabajo más corto se decide por documento
+        # y un documento mediano no queda detrás de los trozos de uno grande
+        costo = trabajo["costo_restante"] if tarea["tipo_tarea"] == "trozo" else tarea["costo"]
+        return (costo - self.envejecimiento * espera, tarea["secuencia"])
+
+    def _despachar(self):
+        while self.pendientes and len(self.en_curso) < self.workers:
+            ahora = time.perf_counter()
+            tarea = min(self.pendientes, key=lambda t: self.prioridad(t, ahora))
+            self.pendientes.remove(tarea)
+
+            trabajo = tarea["trabajo"]
+            try:
+                if tarea["tipo_tarea"] == "trozo":
+                    futuro = self.pool.submit(extraer_paginas, trabajo["pdf_path"], tarea["inicio"], tarea["fin"])
+                else:
+                    futuro = self.pool.submit(ejecutar, trabajo["pdf_path"], trabajo.get("tipo", "todo"),
+                                              bool(trabajo.get("mmap")), tarea.get("paginas"))
+            except BrokenProcessPool:
+                # El pool se rompió antes de que paso() lo notara: la tarea no
+                # llegó a correr, vuelve a la cola y las que estaban en curso
+                # fallarán en paso()
+                self.pendientes.append(tarea)
+                self._reemplazar_pool()
+                continue
+            self.en_curso[futuro] = tarea
+
+    def paso(self, timeout=None) -> list:
+        """
+        Despacha lo que quepa y espera a que termine al menos una tarea
+
+        Returns:
+            list: [(trabajo, resultado)] de los trabajos que terminaron
+        """
+        self._despachar()
+        if not self.en_curso:
+            return []
+
+        listos, _ = wait(list(self.en_curso), timeout=timeout, return_when=FIRST_COMPLETED)
+        terminados = []
+
+        for futuro in listos:
+            tarea = self.en_curso.pop(futuro, None)
+            if tarea is None:
+                continue    # ya se dio por fallida al romperse el pool
+            trabajo = tarea["trabajo"]
+            if trabajo.get("terminado"):
+                continue    # trozo de un trabajo que ya falló
+
+            try:
+                valor = futuro.result()
+            except BrokenProcessPool:
+                terminados.extend(self._recuperar_pool(tarea))
+                continue
+            except Exception as e:
+                log_debug(f"Error en {os.path.basename(trabajo['pdf_path'])}: {str(e)}")
+                terminados.append(self._fallar(trabajo, str(e)))
+                continue
+
+            if tarea["tipo_tarea"] != "trozo":
+                terminados.append(self._terminar(trabajo, valor))
+                continue
+
+            trabajo["trozos"][tarea["indice"]] = valor
+            trabajo["faltan"] -= 1
+            trabajo["costo_restante"] -= tarea["costo"]
+            if trabajo["faltan"] == 0:
+                # Todas las páginas listas: el último paso las recibe directamente
+                # (el sidecar es solo para futuras subidas, puede vencer o borrarse)
+                paginas = [pagina for trozo in trabajo.pop("trozos") for pagina in trozo]
+                guardar_sidecar(trabajo["clave"], paginas)
+                self._encolar(trabajo, "final", SEGUNDOS_DESDE_CACHE, paginas=paginas)
+
+        return terminados
+
+    def _fallar(self, trabajo: dict, error: str) -> tuple:
+        """Termina el trabajo con error y descarta sus tareas pendientes"""
+        self.pendientes = [t for t in self.pendientes if t["trabajo"] is not trabajo]
+        return self._terminar(trabajo, {"success": False, "error": error})
+
+    def _recuperar_pool(self, tarea: dict) -> list:
+        """
+        Un worker murió (p. ej. sin memoria con un PDF grande) y el pool quedó
+        roto: fallan solo los trabajos con tareas en curso, se crea un pool
+        nuevo y lo pendiente sigue en la cola
+        """
+        error = "El proceso de extracción terminó inesperadamente"
+        log_debug(f"Pool roto en {os.path.basename(tarea['trabajo']['pdf_path'])}: se reinicia")
+
+        fallidas = [tarea]
+        for futuro, otra in list(self.en_curso.items()):
+            # Las que alcanzaron a terminar bien se recogen en el próximo paso
+            if futuro.done() and futuro.exception() is None:
+                continue
+            del self.en_curso[futuro]
+            fallidas.append(otra)
+
+        terminados = []
+        for otra in fallidas:
+            if not otra["trabajo"].get("terminado"):
+                terminados.append(self._fallar(otra["trabajo"], error))
+
+        self._reemplazar_pool()
+        return terminados
+
+    def _reemplazar_pool(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = self._crear_pool()
+
+    def _terminar(self, trabajo: dict, resultado: dict) -> tuple:
+        trabajo["terminado"] = True
+        self.latencias[trabajo["clase"]].append((time.perf_counter() - trabajo["llegada"]) * 1000)
+        self.trabajos_por_clase[trabajo["clase"]] += 1
+        return trabajo, resultado
+
+    # === MÉTRICAS ===
+    def estadisticas(self) -> dict:
+        """
+        Latencia (desde que llegó hasta que terminó) p50/p95 por clase de
+        tamaño, sobre las últimas MUESTRAS_LATENCIA de cada clase
+        """
+        estadisticas = {}
+        for clase, _ in CLASES_TAMANO:
+            valores = self.latencias.get(clase)
+            if valores:
+                estadisticas[clase] = {
+                    "trabajos": self.trabajos_por_clase[clase],
+                    "p50_ms": round(percentil(valores, 50), 1),
+                    "p95_ms": round(percentil(valores, 95), 1),
+                }
+        return estadisticas
+
+    def cerrar(self):
+        self.pool.shutdown()
+
+
+def procesar_lote(pdf_paths: list, tipo: str = "todo", workers=None) -> dict:
+    """
+    Procesa un lote de PDFs con el planificador
+
+    Returns:
+        dict: {"resultados": [resultado por PDF, en el orden recibido],
+               "estadisticas": {...}}
+    """
+    planificador = Planificador(workers)
+    try:
+        for indice, pdf_path in enumerate(pdf_paths):
+            planificador.enviar({"id": indice, "pdf_path": pdf_path, "tipo": tipo})
+
+        resultados = [None] * len(pdf_paths)
+        while planificador.ocupado():
+            for trabajo, resultado in planificador.paso():
+                resultados[trabajo["id"]] = resultado
+
+        return {"resultados": resultados, "estadisticas": planificador.estadisticas()}
+    finally:
+        planificador.cerrar()
+
+
+def atender(entrada=sys.stdin, salida=sys.stdout, workers=None):
+    """
+    Mismo protocolo que worker/zygote.py (una línea JSON por trabajo), pero
+    los trabajos se ejecutan en paralelo y en orden de prioridad, así que
+    las respuestas pueden salir en otro orden (se identifican por "id").
+    {"accion": "estadisticas"} responde las latencias por clase de tamaño
+    """
+    planificador = Planificador(workers)
+    cola = queue.Queue()
+
+    def leer():
+        for linea in entrada:
+            cola.put(linea)
+        cola.put(None)
+
+    threading.Thread(target=leer, daemon=True).start()
+
+    def responder(id_trabajo, resultado: dict):
+        salida.write(json.dumps({"id": id_trabajo, **resultado}, ensure_ascii=False) + "\n")
+        salida.flush()
+
+    abierta = True
+    try:
+        while abierta or planificador.ocupado():
+            # Recibir trabajos nuevos (bloquea solo si no hay nada en curso)
+            while abierta:
+                try:
+                    linea = cola.get(block=not planificador.ocupado())
+                except queue.Empty:
+                    break
+                if linea is None:
+                    abierta = False
+                    break
+
+                linea = linea.strip()
+                if not linea:
+                    continue
+                try:
+                    trabajo = json.loads(linea)
+                    if trabajo.get("accion") == "estadisticas":
+                        responder(trabajo.get("id"), {"success": True, "data": planificador.estadisticas()})
+                        continue
+                    if "pdf_path" not in trabajo:
+                        raise KeyError("pdf_path")
+                except (ValueError, KeyError, AttributeError) as e:
+                    responder(None, {"success": False, "error": f"Trabajo inválido: {e}"})
+                    continue
+                planificador.enviar(trabajo)
+
+            for trabajo, resultado in planificador.paso(timeout=INTERVALO_SONDEO):
+                responder(trabajo.get("id"), resultado)
+    finally:
+        log_debug(f"Latencias por clase: {json.dumps(planificador.estadisticas(), ensure_ascii=False)}")
+        planificador.cerrar()
+
+
+# === PRUEBA DEL MÓDULO ===
+if __name__ == "__main__":
+    configurar_utf8()
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("atender", "lote") or (sys.argv[1] == "lote" and len(sys.argv) < 4):
+        print("Uso: python worker/planificador.py atender [workers]\n"
+              "     python worker/planificador.py lote <tipo> <pdf> [<pdf> ...]", file=sys.stderr)
+        sys.exit(1)
+
+    # Importar todo lo pesado una sola vez antes de crear los workers
+    precargar()
+
+    if sys.argv[1] == "atender":
+        atender(workers=int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    else:
+        lote = procesar_lote(sys.argv[3:], sys.argv[2])
+        print(json.dumps({"success": True, **lote}, ensure_ascii=False, indent=2))
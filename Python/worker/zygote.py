@@ -0,0 +1,99 @@
+import sys
+import os
+import json
+
+# Permite ejecutar como "python worker/zygote.py" desde cualquier cwd
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import configurar_utf8, precargar, procesar_pdf
+from utils.entrega_resultado import escribir_resultado
+
+def log_debug(mensaje):
+    """Enviar logs a stderr para no contaminar stdout"""
+    print(mensaje, file=sys.stderr, flush=True)
+
+def ejecutar(pdf_path: str, tipo: str, mmap: bool = False, paginas=None) -> dict:
+    """
+    Ejecuta la extracción. Con mmap=True un resultado exitoso se entrega
+    como {"success", "handle", "longitud"} (utils.entrega_resultado).
+    paginas: filas ya extraídas, se pasan tal cual a procesar_pdf
+    """
+    resultado = procesar_pdf(pdf_path, tipo, paginas)
+    if mmap and resultado["success"]:
+        return {"success": True, **escribir_resultado(resultado)}
+    return resultado
+
+def ejecutar_en_hijo(pdf_path: str, tipo: str, mmap: bool = False) -> dict:
+    """
+    Hace fork del proceso (que ya tiene pdfplumber/pdfminer importados)
+    y ejecuta la extracción en el hijo. El resultado vuelve por un pipe,
+    así un fallo del hijo no tumba el zygote. Con mmap=True el hijo
+    escribe el archivo y por el pipe solo viaja el handle.
+    """
+    lectura, escritura = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(lectura)
+        try:
+            datos = json.dumps(ejecutar(pdf_path, tipo, mmap), ensure_ascii=False)
+        except BaseException as e:
+            datos = json.dumps({"success": False, "error": str(e)}, ensure_ascii=False)
+        with os.fdopen(escritura, 'w', encoding='utf-8') as salida:
+            salida.write(datos)
+        os._exit(0)
+
+    os.close(escritura)
+    with os.fdopen(lectura, 'r', encoding='utf-8') as entrada:
+        datos = entrada.read()
+    _, estado = os.waitpid(pid, 0)
+
+    if not datos:
+        return {"success": False, "error": f"El proceso hijo terminó sin resultado (estado {estado})"}
+    return json.loads(datos)
+
+def atender(entrada=sys.stdin, salida=sys.stdout):
+    """
+    Lee trabajos (una línea JSON por trabajo) y responde una línea JSON por
+    cada uno:
+        entrada: {"id": 1, "pdf_path": "...", "tipo": "raps", "mmap": false}
+        salida:  {"id": 1, "success": true, "data": {...}}
+                 {"id": 1, "success": true, "handle": "...", "longitud": 1234} (mmap)
+    """
+    usar_fork = hasattr(os, 'fork')
+    if not usar_fork:
+        log_debug("os.fork no disponible: los trabajos se ejecutan en el mismo proceso")
+
+    for linea in entrada:
+        linea = linea.strip()
+        if not linea:
+            continue
+
+        try:
+            trabajo = json.loads(linea)
+            if not isinstance(trabajo, dict):
+                raise ValueError("se esperaba un objeto JSON")
+            pdf_path = trabajo["pdf_path"]
+            tipo = trabajo.get("tipo", "todo")
+            mmap = bool(trabajo.get("mmap"))
+        except (ValueError, KeyError) as e:
+            resultado = {"success": False, "error": f"Trabajo inválido: {e}"}
+            trabajo = {}
+        else:
+            if usar_fork:
+                resultado = ejecutar_en_hijo(pdf_path, tipo, mmap)
+            else:
+                resultado = ejecutar(pdf_path, tipo, mmap)
+
+        respuesta = {"id": trabajo.get("id"), **resultado}
+        salida.write(json.dumps(respuesta, ensure_ascii=False) + "\n")
+        salida.flush()
+
+if __name__ == "__main__":
+    configurar_utf8()
+
+    # Importar todo lo pesado una sola vez antes de empezar a hacer fork
+    precargar(sys.argv[1] if len(sys.argv) > 1 else 'todo')
+    log_debug("Zygote listo")
+
+    atender()
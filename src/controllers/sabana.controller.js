@@ -508,6 +508,50 @@ class SabanaController {
     }
   }
 
+  /**
+   * POST /sabana/recalcular/:id_ficha
+   * Recalcula las horas de toda la sábana de la ficha en una sola llamada
+   * Body: { modo? } ("igual", "semanas" o "balanceado")
+   */
+  async recalcularSabana(req, res) {
+    try {
+      const { id_ficha } = req.params;
+      const { modo } = req.body || {};
+
+      if (!id_ficha || isNaN(parseInt(id_ficha))) {
+        return res.status(400).json({
+          success: false,
+          mensaje: 'ID de ficha inválido'
+        });
+      }
+
+      if (modo !== undefined && !['igual', 'semanas', 'balanceado'].includes(modo)) {
+        return res.status(400).json({
+          success: false,
+          mensaje: 'Modo de reparto inválido'
+        });
+      }
+
+      const idFicha = parseInt(id_ficha);
+      const plan = await this.sabanaService.recalcularSabana(idFicha, modo);
+      const sabana = await this.sabanaService.obtenerSabanaMatriz(idFicha);
+
+      return res.json({
+        success: true,
+        mensaje: 'Sábana recalculada exitosamente',
+        alertas: plan.alertas,
+        trimestres: plan.trimestres,
+        sabana: sabana
+      });
+    } catch (error) {
+      console.error('Error en recalcularSabana:', error);
+      return res.status(500).json({
+        success: false,
+        mensaje: 'Error al recalcular sábana: ' + (error.message || error.error)
+      });
+    }
+  }
+
   /**
    * GET /sabana/matriz/:id_ficha
    * Consulta la vista v_sabana_matriz filtrada por ficha
@@ -49,6 +49,10 @@ router.patch('/sabana/update-hours', (req, res) =>
   sabanaController.actualizarHoras(req, res)
 );
 
+router.post('/sabana/recalcular/:id_ficha', (req, res) =>
+  sabanaController.recalcularSabana(req, res)
+);
+
 // ============================================
 // GESTIÓN DE INSTRUCTORES
 // ============================================
@@ -1,4 +1,5 @@
 const { spawn } = require('child_process');
+const fs = require('fs');
 const path = require('path');
 
 class PythonService {
@@ -6,19 +7,28 @@ class PythonService {
      * Ejecuta el script Python y retorna el resultado
      * @param {string} pdfPath - Ruta absoluta al PDF
      * @param {string} tipo - 'programa', 'competencias', 'proyecto', 'todo'
+     * @param {Object} opciones
+     * @param {boolean} opciones.mmap - Recibir el resultado en un archivo mapeado
+     *   (python main.py ... --mmap) en vez de por stdout
      * @returns {Promise<Object>} - Resultado parseado
      */
-    static ejecutarScript(pdfPath, tipo = 'todo') {
+    static ejecutarScript(pdfPath, tipo = 'todo', { mmap = process.env.PYTHON_RESULTADO_MMAP === '1' } = {}) {
         return new Promise((resolve, reject) => {
             const scriptPath = path.join(__dirname, '../../python/main.py');
 
             // Spawn del proceso Python
             const pythonPath = path.join(__dirname, '../../.venv/Scripts/python.exe');
-            const python = spawn(pythonPath, [scriptPath, pdfPath, tipo]);
+            const args = [scriptPath, pdfPath, tipo];
+            if (mmap) args.push('--mmap');
+            const python = spawn(pythonPath, args);
 
             let dataString = '';
             let errorString = '';
 
+            // Decodificar como stream: un carácter UTF-8 puede quedar partido entre chunks
+            python.stdout.setEncoding('utf8');
+            python.stderr.setEncoding('utf8');
+
             // Capturar stdout
             python.stdout.on('data', (data) => {
                 dataString += data.toString();
@@ -43,7 +53,12 @@ class PythonService {
                 }
 
                 try {
-                    const resultado = JSON.parse(dataString);
+                    let resultado = JSON.parse(dataString);
+
+                    // Con --mmap stdout solo trae { success, handle, longitud }
+                    if (resultado.handle) {
+                        resultado = PythonService.leerResultadoMapeado(resultado.handle, resultado.longitud);
+                    }
                     
                     if (!resultado.success) {
                         return reject({
@@ -71,6 +86,76 @@ class PythonService {
             });
         });
     }
+
+    /**
+     * Recalcula las horas de una sábana con planeacion/planificador_horas.py
+     * @param {Object} entrada - { filas, semanas?, modo? } (filas de v_sabana_base)
+     * @returns {Promise<Object>} - { asignaciones, trimestres, alertas }
+     */
+    static planificarHoras(entrada) {
+        return new Promise((resolve, reject) => {
+            const scriptPath = path.join(__dirname, '../../python/planeacion/planificador_horas.py');
+            const pythonPath = path.join(__dirname, '../../.venv/Scripts/python.exe');
+            const python = spawn(pythonPath, [scriptPath]);
+
+            let dataString = '';
+            let errorString = '';
+
+            python.stdout.setEncoding('utf8');
+            python.stderr.setEncoding('utf8');
+            python.stdout.on('data', (data) => { dataString += data; });
+            python.stderr.on('data', (data) => { errorString += data; });
+
+            python.on('close', (code) => {
+                if (code !== 0) {
+                    return reject({
+                        error: 'Error en el planificador de horas',
+                        details: errorString,
+                        code: code
+                    });
+                }
+
+                try {
+                    const resultado = JSON.parse(dataString);
+                    if (!resultado.success) {
+                        return reject({ error: 'Python retornó error', details: resultado.error });
+                    }
+                    resolve(resultado.data);
+                } catch (parseError) {
+                    reject({
+                        error: 'Error al parsear JSON de Python',
+                        details: parseError.message,
+                        raw: dataString
+                    });
+                }
+            });
+
+            python.on('error', (error) => {
+                reject({
+                    error: 'No se pudo ejecutar Python',
+                    details: error.message
+                });
+            });
+
+            // Las filas van por stdin (pueden ser miles, no caben en argv)
+            python.stdin.end(JSON.stringify(entrada));
+        });
+    }
+
+    /**
+     * Lee el JSON compacto que dejó utils/entrega_resultado.py y borra el archivo
+     * @param {string} handle - Ruta del archivo temporal
+     * @param {number} longitud - Bytes válidos
+     * @returns {Object} - Resultado { success, data | error }
+     */
+    static leerResultadoMapeado(handle, longitud) {
+        try {
+            const buffer = fs.readFileSync(handle);
+            return JSON.parse(buffer.toString('utf8', 0, longitud));
+        } finally {
+            fs.unlink(handle, () => {});
+        }
+    }
 }
 
 module.exports = PythonService;
\ No newline at end of file
@@ -1,4 +1,9 @@
 const db = require("../config/conexion_db");
+const PythonService = require("./pythonService");
+
+// Reparto de horas del planificador: "igual" (cálculo oficial, como
+// recalcular_horas_rap), "semanas" o "balanceado" (empareja la carga semanal)
+const MODO_HORAS = process.env.SABANA_MODO_HORAS || "igual";
 
 /**
  * Servicio para gestionar el alistamiento de RAPs (Resultados de Aprendizaje)
@@ -218,8 +223,6 @@ class SabanaService {
       ]);
 
       return true;
-
-      return true;
     } catch (error) {
       console.error("Error en asignarRapTrimestre:", error);
       throw error;
@@ -261,6 +264,75 @@ class SabanaService {
     }
   }
 
+  /**
+   * Recalcula las horas de toda la sábana de una ficha en una sola llamada
+   * al planificador de Python (en vez de un CALL recalcular_horas_rap por RAP)
+   * y guarda el resultado en rap_trimestre. Las ediciones de un solo RAP
+   * siguen usando el procedimiento almacenado
+   * @param {number} id_ficha - ID de la ficha
+   * @param {string} modo - "igual", "semanas" o "balanceado"
+   * @returns {Promise<Object>} Resultado del planificador { asignaciones, trimestres, alertas }
+   */
+  async recalcularSabana(id_ficha, modo = MODO_HORAS) {
+    const connection = await db.getConnection();
+
+    try {
+      await connection.beginTransaction();
+
+      // Bloquear las asignaciones de la ficha hasta el COMMIT: un quitar o
+      // mover concurrente espera y no se pisa con las horas calculadas
+      await connection.query(
+        `SELECT id_rap_trimestre FROM rap_trimestre WHERE id_ficha = ? FOR UPDATE`,
+        [id_ficha]
+      );
+
+      // v_sabana_base cruza con todos los trimestres: quedarse con los de la ficha
+      const [filas] = await connection.query(
+        `SELECT id_competencia, duracion_maxima, id_rap, id_trimestre, no_trimestre, id_rap_trimestre
+         FROM v_sabana_base
+         WHERE id_ficha = ?
+           AND id_trimestre IN (SELECT id_trimestre FROM trimestre WHERE id_ficha = ?)`,
+        [id_ficha, id_ficha]
+      );
+
+      if (filas.length === 0) {
+        await connection.commit();
+        return { asignaciones: [], trimestres: [], alertas: {} };
+      }
+
+      const plan = await PythonService.planificarHoras({ filas, modo });
+      const asignaciones = plan.asignaciones;
+
+      // Un solo UPDATE con CASE: solo toca filas existentes, nunca inserta
+      if (asignaciones.length > 0) {
+        const casos = asignaciones.map(() => "WHEN ? THEN ?").join(" ");
+        const ids = asignaciones.map((a) => a.id_rap_trimestre);
+        await connection.query(
+          `UPDATE rap_trimestre
+           SET horas_trimestre = CASE id_rap_trimestre ${casos} END,
+               horas_semana = CASE id_rap_trimestre ${casos} END
+           WHERE id_ficha = ? AND id_rap_trimestre IN (?)`,
+          [
+            ...asignaciones.flatMap((a) => [a.id_rap_trimestre, a.horas_trimestre]),
+            ...asignaciones.flatMap((a) => [a.id_rap_trimestre, a.horas_semana]),
+            id_ficha,
+            ids,
+          ]
+        );
+      }
+
+      await connection.commit();
+
+      return plan;
+    } catch (error) {
+      await connection.rollback();
+      console.error("Error en recalcularSabana:", error);
+      throw error;
+    } finally {
+      connection.release();
+    }
+  }
+
   /**
    * Obtiene los trimestres de una ficha
    * @param {number} id_ficha - ID de la ficha